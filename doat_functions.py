@@ -15,6 +15,7 @@
 """
 
 # Import standard modules.
+import contextlib
 import datetime
 import os
 import re
@@ -22,6 +23,7 @@ import signal
 import subprocess
 import sys
 import time
+import zipfile
 
 # Import third-party modules.
 try:
@@ -29,12 +31,32 @@ try:
 except ImportError:
     sys.exit('The python module \'configparser\' must be installed to use '
              'DOAT.\nInstall it using pip or the supplied requirements.txt')
+try:
+    import numpy as np
+except ImportError:
+    sys.exit('The python module \'numpy\' must be installed to use DOAT.\n'
+             'Install it using pip or the supplied requirements.txt')
 try:
     from tqdm import tqdm
     TQDM_ENABLED = True
 except ImportError:
     TQDM_ENABLED = False
 
+# Global variables.
+# Required options in the DOAT section of the config, with the config key,
+#   option name, type, printed label and description used if it is missing.
+DOAT_REQUIRED_OPTIONS = (
+    ('startup_time', 'startuptime', int, 'Startup time for DPDK App:',
+     'startup time'),
+    ('test_runtime', 'testruntime', int, 'Run time for Test:',
+     'test run time'),
+    ('test_step_size', 'teststepsize', float, 'Step size for Test:',
+     'test step size'),
+    ('server_port', 'serverport', int, 'Results server port:', 'server port'))
+# Seconds to wait for a measurement tool to exit after it is killed before
+#   it is force killed.
+TOOL_EXIT_TIMEOUT = 10
+
 
 def check_pid(pid):
     """
@@ -99,6 +121,35 @@ def progress_bar(seconds):
             time.sleep(1)
 
 
+def build_progress(build_proc):
+    """
+    Function to wait for a build process to finish and display the build time
+    and a running animation to the user.
+
+    The progress of the build is too hard to track and keep clean, this
+    animation will however let the user know it hasn't crashed.
+
+    :param build_proc: The Popen object of the build process.
+    :return: This function has no return value.
+    """
+    animation = '|/-\\'
+    animation_index = 0
+    build_start = time.monotonic()
+    while True:
+        # Block on the build for up to a second rather than polling it, the
+        #   elapsed time comes from the monotonic clock so it does not drift.
+        try:
+            build_proc.wait(timeout=1)
+            break
+        except subprocess.TimeoutExpired:
+            mins, secs = divmod(int(time.monotonic() - build_start), 60)
+            print('Building . . .',
+                  f'{mins:02d}:{secs:02d}',
+                  animation[animation_index % len(animation)],
+                  end='\r')
+            animation_index += 1
+
+
 def kill_group_pid(pid):
     """
     Function to kill a process and all of its children using PID.
@@ -109,6 +160,283 @@ def kill_group_pid(pid):
     os.killpg(os.getpgid(pid), signal.SIGTERM)
 
 
+@contextlib.contextmanager
+def measurement_tools(config, dpdk_proc, csv_suffix=''):
+    """
+    Context manager to start the measurement tools for a test and kill them
+    once the test is over.
+
+    PCM, IPMItool and telemetry (if enabled) are started and given 2 seconds
+    to startup, if any of them dies the others and the DPDK app are killed
+    and DOAT aborts.
+
+    :param config: The DOAT config dict.
+    :param dpdk_proc: The Popen object of the DPDK app being tested.
+    :param csv_suffix: Suffix for the names of the CSVs, e.g. '_op'.
+    :return: This function yields once all of the tools are running.
+    """
+    # Each tool is started in a new session so it can be killed along with
+    #   its children, start_new_session avoids running a python preexec_fn
+    #   in the child process. The shell execs each tool so that the process
+    #   that is waited on is the tool itself.
+    tool_args = {'stdout': subprocess.DEVNULL,
+                 'stderr': subprocess.STDOUT,
+                 'shell': True,
+                 'start_new_session': True}
+
+    # PCM will measure cpu and platform metrics.
+    pcm_proc = subprocess.Popen(f'exec {config["pcm_dir"]}pcm.x '
+                                f'{config["test_step_size"]} '
+                                f'-csv=tmp/pcm{csv_suffix}.csv',
+                                **tool_args)
+
+    # IPMItool is used to measure platform power usage, the tool runs it every
+    #   step and parses its output in one process so no shell pipeline has to
+    #   be forked for each sample.
+    power_proc = subprocess.Popen('exec ./tools/ipmitool_power_csv.py '
+                                  f'-c tmp/wallpower{csv_suffix}.csv '
+                                  f'-s {config["test_step_size"]}',
+                                  **tool_args)
+
+    # Tools in the order that they are checked with their abort messages.
+    tools = [(power_proc, 'IPMItool died or failed to start, ABORT!'),
+             (pcm_proc, 'PCM died or failed to start, ABORT! (If problem '
+                        'persists, try to execute \'modprobe msr\' as root '
+                        'user)')]
+
+    # If telemetry is enabled then spawn the telemetry tool, this tool uses
+    #   the DPDK telemetry API to get statistics about the DPDK app.
+    if config['telemetry'] is True:
+        telemetry_proc = subprocess.Popen(
+            'exec ./tools/dpdk_telemetry_auto_csv.py '
+            f'-c tmp/telemetry{csv_suffix}.csv '
+            f'-r {config["test_runtime"] + 2} '
+            f'-s {config["test_step_size"]} '
+            f'-f {config["file_prefix"]} '
+            f'-p {config["telemetry_port"]}',
+            **tool_args)
+        tools.append((telemetry_proc,
+                      'Telemetry died or failed to start, ABORT!'))
+
+    # Wait 2 seconds for the measurement tools to startup.
+    progress_bar(2)
+
+    # Check that every tool is still alive after startup. Abort if not.
+    for proc, abort_msg in tools:
+        if proc.poll() is not None:
+            for other_proc, _ in tools:
+                if other_proc is not proc:
+                    kill_group_pid(other_proc.pid)
+            kill_group_pid(dpdk_proc.pid)
+            sys.exit(abort_msg)
+
+    # Kill all of the tools once the test is over, even if it was abandoned.
+    # Wait for them to exit so that any buffered output is in their CSVs
+    #   before it is analysed, a tool that has not exited within the timeout
+    #   is force killed so that DOAT cannot hang here.
+    try:
+        yield
+    finally:
+        for proc, _ in tools:
+            kill_group_pid(proc.pid)
+        for proc, _ in tools:
+            try:
+                proc.wait(timeout=TOOL_EXIT_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                os.killpg(proc.pid, signal.SIGKILL)
+                proc.wait()
+
+
+def normalise_pcm_csv(csv_path):
+    """
+    Function to replace the semicolons in a PCM CSV with commas.
+
+    The converted CSV is kept for the report download and its lines are
+    returned so that it can be parsed without reading the file again.
+
+    :param csv_path: The path of the PCM CSV.
+    :return: List of the lines of the comma separated CSV.
+    """
+    # Work on the raw bytes as there is no need to decode the CSV to swap a
+    #   single ASCII character, the swap keeps the length of the file so it
+    #   is overwritten in place through the same handle.
+    with open(csv_path, 'r+b') as csv_file:
+        csv_data = csv_file.read().replace(b';', b',')
+        csv_file.seek(0)
+        csv_file.write(csv_data)
+    return csv_data.decode().splitlines()
+
+
+def read_pcm_csv(csv_lines, columns):
+    """
+    Function to read a set of columns from a PCM CSV into a numpy array.
+
+    PCM CSVs have two header rows, the first names the socket or core that a
+    group of columns belongs to and the second names the metrics in the group.
+    Columns are selected using the name of their group and their offset from
+    the first column of the group.
+
+    :param csv_lines: The lines of the PCM CSV (comma separated).
+    :param columns: List of (group name, offset) tuples of the columns.
+    :return: Tuple of the number of datapoints in the CSV and a float64 array
+        with a row for each of the requested columns.
+    """
+    # Map each group name to the position of its first column.
+    header = csv_lines[0].split(',')
+    groups = {}
+    for idx, name in enumerate(header):
+        if name:
+            groups.setdefault(name, idx)
+
+    # Only parse the required columns and skip both header rows. The columns
+    #   are kept in float64 as the cache misses are scaled into the tens of
+    #   millions where float32 cannot hold the reported precision.
+    data = np.loadtxt(csv_lines,
+                      delimiter=',',
+                      skiprows=2,
+                      usecols=[groups[name] + offset
+                               for name, offset in columns],
+                      dtype=np.float64,
+                      ndmin=2)
+
+    # The datapoints include the metric names row as pandas would count it.
+    datapoints = (data.shape[0] + 1) * len(header)
+
+    return datapoints, np.ascontiguousarray(data.T)
+
+
+def counter_rate(counter, scale):
+    """
+    Function to calculate the rate of a counter for every step of a test.
+
+    No previous element exists for the zeroth element so it takes the same
+    value as the first element. A counter with fewer than two samples has
+    no change to measure so its rate is zero.
+
+    :param counter: Array of the counter value at every step.
+    :param scale: The factor to convert the change per step into the rate.
+    :return: Float64 array of the rate at every step.
+    """
+    if counter.size < 2:
+        return np.zeros(counter.size, dtype=np.float64)
+    rate = np.empty(counter.size, dtype=np.float64)
+    # Subtract and scale straight into the output array so no temporary
+    #   array of the differences is needed.
+    np.subtract(counter[1:], counter[:-1], out=rate[1:])
+    rate[1:] *= scale
+    rate[0] = rate[1]
+    return rate
+
+
+def get_dpdk_config(dpdk_location, names):
+    """
+    Function to get the values of defines in the DPDK configuration
+    (config/rte_config.h).
+
+    :param dpdk_location: The root path of DPDK.
+    :param names: List of the names of the defines.
+    :return: Dict of the names of the defines and their values, defines that
+        are not set are given an empty value.
+    """
+    config_path = os.path.join(dpdk_location, 'config', 'rte_config.h')
+
+    # Read the config once and find every define in one pass.
+    define_pattern = re.compile(
+        r'^#define\s+(' + '|'.join(map(re.escape, names)) + r')\b(.*)$',
+        flags=re.MULTILINE)
+    with open(config_path, 'r') as config_file:
+        config_text = config_file.read()
+
+    # Only the first definition of each define is used.
+    values = {name: '' for name in names}
+    for name, value in reversed(define_pattern.findall(config_text)):
+        values[name] = value.strip()
+
+    return values
+
+
+def set_dpdk_config(dpdk_location, defines):
+    """
+    Function to set the values of defines in the DPDK configuration
+    (config/rte_config.h).
+
+    :param dpdk_location: The root path of DPDK.
+    :param defines: Dict of the names of the defines and their new values.
+    :return: This function has no return value.
+    """
+    config_path = os.path.join(dpdk_location, 'config', 'rte_config.h')
+
+    if not defines:
+        return
+
+    # Build each replacement line once and match every define in one pass.
+    define_lines = {name: f'#define {name} {value}'
+                    for name, value in defines.items()}
+    define_pattern = re.compile(
+        r'^#define\s+(' + '|'.join(map(re.escape, define_lines)) + r')\b.*$',
+        flags=re.MULTILINE)
+
+    # The config is small so read it whole and rewrite it with one write.
+    with open(config_path, 'r') as config_file:
+        config_text = config_file.read()
+    config_text = define_pattern.sub(
+        lambda match: define_lines[match.group(1)], config_text)
+    with open(config_path, 'w') as config_file:
+        config_file.write(config_text)
+
+
+def zip_results(results_dir, config_file, zip_path, skip_files=()):
+    """
+    Function to zip the results of a test along with the DOAT config, the
+    figures are put in a figures directory and the CSVs in a raw_data
+    directory.
+
+    :param results_dir: The directory containing the results.
+    :param config_file: The path of the DOAT config file.
+    :param zip_path: The path of the zip to create.
+    :param skip_files: Names of files in the results directory to leave out.
+    :return: This function has no return value.
+    """
+    # The figures and CSVs are already compressed or compress poorly so the
+    #   fastest compression level is used.
+    with zipfile.ZipFile(zip_path,
+                         'w',
+                         compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=1) as results_zip:
+        results_zip.write(config_file, os.path.basename(config_file))
+        for file_name in sorted(os.listdir(results_dir)):
+            file_path = os.path.join(results_dir, file_name)
+            if (file_name in skip_files or not os.path.isfile(file_path) or
+                    os.path.samefile(file_path, zip_path)):
+                continue
+            if file_name.endswith('.png'):
+                results_zip.write(file_path, f'figures/{file_name}')
+            elif file_name.endswith('.csv'):
+                results_zip.write(file_path, f'raw_data/{file_name}')
+            else:
+                results_zip.write(file_path, file_name)
+
+
+def cpu_socket_map():
+    """
+    Function to find the socket (physical id) of every core on the system.
+
+    :param: This function takes no arguments.
+    :return: Dict mapping each core (processor) number to its socket.
+    """
+    cpu_sockets = {}
+    processor = None
+    with open('/proc/cpuinfo') as cpuinfo:
+        for line in cpuinfo:
+            key, _, value = line.partition(':')
+            key = key.strip()
+            if key == 'processor':
+                processor = int(value)
+            elif key == 'physical id' and processor is not None:
+                cpu_sockets[processor] = int(value)
+    return cpu_sockets
+
+
 def safe_exit():
     """
     Once Test Process is spawned add catch to kill test process and cleanup
@@ -148,46 +476,21 @@ def doat_config(config_file):
     # Store the full json to use for the test configuration in the report.
     config['full_json'] = config_parsed
 
-    # Read and store value for startuptime (will abort if not present).
-    # This is the time in seconds that you want to allow for your app
-    #   to stabilise.
-    config['startup_time'] = config_parsed['DOAT'].get('startuptime')
-    if config['startup_time']:
-        config['startup_time'] = int(config['startup_time'])
-        print('Startup time for DPDK App:', config['startup_time'])
-    else:
-        sys.exit('No startup time was specified (startuptime in config.cfg), '
-                 'ABORT!')
-
-    # Read and store value for testruntime (will abort if not present).
-    # This is the time in seconds that you want the test to run for.
-    config['test_runtime'] = config_parsed['DOAT'].get('testruntime')
-    if config['test_runtime']:
-        config['test_runtime'] = int(config['test_runtime'])
-        print('Run time for Test:', config['test_runtime'])
-    else:
-        sys.exit('No test run time was specified (testruntime in config.cfg), '
-                 'ABORT!')
-
-    # Read and store value for teststepsize (will abort if not present).
-    # This is the resolution of the test in seconds.
-    config['test_step_size'] = config_parsed['DOAT'].get('teststepsize')
-    if config['test_step_size']:
-        config['test_step_size'] = float(config['test_step_size'])
-        print('Step size for Test:', config['test_step_size'])
-    else:
-        sys.exit('No test run time was specified (testruntime in config.cfg), '
-                 'ABORT!')
-
-    # Read and store value for serverport (will abort if not present).
-    # This is the port that the results server will run on.
-    config['server_port'] = config_parsed['DOAT'].get('serverport')
-    if config['server_port']:
-        config['server_port'] = int(config['server_port'])
-        print('Results server port:', config['server_port'])
-    else:
-        sys.exit('No server port was specified (serverport in config.cfg), '
-                 'ABORT!')
+    # Read, convert and store the required DOAT timing and server options
+    #   (will abort if any are not present).
+    # startuptime is the time in seconds that you want to allow for your app
+    #   to stabilise, testruntime is the time in seconds that you want the
+    #   test to run for, teststepsize is the resolution of the test in
+    #   seconds and serverport is the port that the results server will run
+    #   on.
+    doat_section = config_parsed['DOAT']
+    for key, option, option_type, label, description in DOAT_REQUIRED_OPTIONS:
+        value = doat_section.get(option)
+        if not value:
+            sys.exit(f'No {description} was specified ({option} in '
+                     'config.cfg), ABORT!')
+        config[key] = option_type(value)
+        print(label, config[key])
 
     # Read and store value for projectname.
     # This specifies the name of the project for the report.
@@ -320,18 +623,12 @@ def doat_config(config_file):
     config['cache_adjust'] = False
     if (config_parsed['OPTIMISATION'].getboolean('memop') is True and
             config['op_enabled'] is True):
-        memdriver = subprocess.check_output(
-            f'cat {config["dpdk_location"]}/config/rte_config.h | '
-            'grep -m1 RTE_MBUF_DEFAULT_MEMPOOL_OPS ',
-            shell=True).decode(sys.stdout.encoding).rstrip().strip()
-        config['cache_orig'] = (
-            str(re.sub('[^0-9]',
-                       '',
-                       subprocess.check_output(
-                           f'cat {config["dpdk_location"]}/config/'
-                           'rte_config.h | grep -m1 '
-                           'RTE_MEMPOOL_CACHE_MAX_SIZE ',
-                           shell=True).decode(sys.stdout.encoding).strip())))
+        dpdk_defines = get_dpdk_config(config['dpdk_location'],
+                                       ['RTE_MBUF_DEFAULT_MEMPOOL_OPS',
+                                        'RTE_MEMPOOL_CACHE_MAX_SIZE'])
+        memdriver = dpdk_defines['RTE_MBUF_DEFAULT_MEMPOOL_OPS']
+        config['cache_orig'] = re.sub(
+            '[^0-9]', '', dpdk_defines['RTE_MEMPOOL_CACHE_MAX_SIZE'])
         if 'ring_mp_mc' in memdriver:
             config['mem_op'] = True
             print('Memory Optimisation Step is enabled')
@@ -359,17 +656,16 @@ def doat_config(config_file):
     #   (If more than 1 socket use socket not running DPDK app).
     config['test_core'] = config_parsed['CPU'].get('testcore')
 
-    # Read and store value for testsocket using the value for testcore.
-    # This is the socket the tests will run on.
-    config['test_socket'] = int(subprocess.check_output(
-        r"cat /proc/cpuinfo | grep -A 18 'processor\s\+: "
-        f"{config['test_core']}' | grep 'physical id' | head -1 | awk "
-        r"'{print substr($0,length,1)}'",
-        shell=True))
+    # The sockets of all the cores are read from /proc/cpuinfo once and
+    #   looked up for the test and DPDK app cores below.
+    cpu_sockets = cpu_socket_map()
 
     # Abort test if the testcore is not specified.
     if config['test_core']:
         config['test_core'] = int(config['test_core'])
+        # Store value for testsocket using the value for testcore.
+        # This is the socket the tests will run on.
+        config['test_socket'] = cpu_sockets[config['test_core']]
         print('\nTest software core:',
               config['test_core'],
               '(Socket:',
@@ -381,14 +677,11 @@ def doat_config(config_file):
     # This is the master core of the DPDK app.
     config['app_master_enabled'] = True
     config['app_master_core'] = config_parsed['CPU'].get('appmaster')
-    # Find the socket that the master core runs on.
-    config['app_master_socket'] = int(subprocess.check_output(
-        r"cat /proc/cpuinfo | grep -A 18 'processor\s\+: "
-        f"{config['app_master_core']}' | grep 'physical id' | head -1 "
-        r"| awk '{print substr($0,length,1)}'",
-        shell=True))
+    config['app_master_socket'] = None
     if config['app_master_core']:
         config['app_master_core'] = int(config['app_master_core'])
+        # Find the socket that the master core runs on.
+        config['app_master_socket'] = cpu_sockets[config['app_master_core']]
         print('DPDK app master core:',
               config['app_master_core'],
               '(Socket:',
@@ -419,13 +712,8 @@ def doat_config(config_file):
                  'ABORT!')
 
     # Find and store the values of the sockets that the DPDK app cores are on.
-    config['app_cores_sockets'] = []
-    for cores in config['app_cores']:
-        config['app_cores_sockets'].append(int(subprocess.check_output(
-            r"cat /proc/cpuinfo | grep -A 18 'processor\s\+: "
-            f"{cores}' | grep 'physical id' | head -1 "
-            r"| awk '{print substr($0,length,1)}'",
-            shell=True)))
+    config['app_cores_sockets'] = [cpu_sockets[core]
+                                   for core in config['app_cores']]
 
     # Check that all DPDK cores are on the same socket.
     # Will abort if the are not on the same socket as this is very bad
@@ -459,11 +747,9 @@ def doat_config(config_file):
 
     # Store the original cpu affinity that programs are launched with
     #   before we pin DOAT to a core this means we can unpin DOAT.
-    config['cpu_aff_orig'] = subprocess.check_output(
-        f'taskset -cp {os.getpid()}',
-        shell=True).decode(
-            sys.stdout.encoding).rstrip().split(':', 1)[-1].strip()
-    print('\nOriginal CPU Affinity:', config['cpu_aff_orig'])
+    config['cpu_aff_orig'] = os.sched_getaffinity(0)
+    print('\nOriginal CPU Affinity:',
+          ','.join(map(str, sorted(config['cpu_aff_orig']))))
 
     # Return all config options in a dict
     return config
@@ -21,25 +21,22 @@
 
 # Import standard modules.
 import atexit
-import fileinput
-from http.server import SimpleHTTPRequestHandler, HTTPServer
+import importlib.util
 import os
+import shutil
 import subprocess
 import sys
-import time
+import threading
+import zipfile
+from string import Template
 from time import gmtime, strftime
 
 # Import third-party modules.
 try:
-    from json2html import json2html
-    JSON2HTML_AVAILABLE = True
-except ImportError:
-    JSON2HTML_AVAILABLE = False
-    print('The python module \'json2html\' must be installed to show the DOAT,'
-          'configuartion in the report, this has been disabled for now.\n'
-          'It can be installed using pip or the supplied requirements.txt')
-try:
-    import matplotlib.pyplot as plt
+    import matplotlib
+    # The figures are only ever saved as PNGs, select the Agg backend before
+    #   pyplot is imported so no GUI backend is probed or loaded.
+    matplotlib.use('Agg')
 except ImportError:
     sys.exit('The python module \'matplotlib\' must be installed to use DOAT.'
              '\nInstall it using pip or the supplied requirements.txt')
@@ -53,19 +50,320 @@ try:
 except ImportError:
     sys.exit('The python module \'pandas\' must be installed to use DOAT.\n'
              'Install it using pip or the supplied requirements.txt')
-try:
-    import pdfkit
-    PDFKIT_AVAILABLE = True
-except ImportError:
-    PDFKIT_AVAILABLE = False
-    print('The python module \'pdfkit\' must be installed to generate PDFs,'
-          'PDF generation has been disabled. It can be installed by '
-          'installing the wkhtmltopdf package and then install the python '
-          'module using pip or the supplied requirements.txt')
 
 # Import custom modules.
-from doat_functions import (check_pid, doat_config, doat_motd, kill_group_pid,
-                            progress_bar, safe_exit)
+from doat_functions import (build_progress, check_pid, counter_rate,
+                            doat_config, doat_motd, kill_group_pid,
+                            measurement_tools, normalise_pcm_csv, progress_bar,
+                            read_pcm_csv, safe_exit, set_dpdk_config,
+                            zip_results)
+
+# Check for optional third-party modules.
+# json2html and pdfkit are only needed once the report is being written, only
+#   check that they are installed here and import them when they are used.
+JSON2HTML_AVAILABLE = importlib.util.find_spec('json2html') is not None
+if JSON2HTML_AVAILABLE is False:
+    print('The python module \'json2html\' must be installed to show the DOAT,'
+          'configuartion in the report, this has been disabled for now.\n'
+          'It can be installed using pip or the supplied requirements.txt')
+# The wkhtmltopdf binary used by pdfkit is also looked up once here.
+WKHTMLTOPDF_PATH = shutil.which('wkhtmltopdf')
+PDFKIT_AVAILABLE = (importlib.util.find_spec('pdfkit') is not None and
+                    WKHTMLTOPDF_PATH is not None)
+if PDFKIT_AVAILABLE is False:
+    print('The python module \'pdfkit\' and wkhtmltopdf must be installed to '
+          'generate PDFs, PDF generation has been disabled. They can be '
+          'installed by installing the wkhtmltopdf package and then install '
+          'the python module using pip or the supplied requirements.txt')
+
+# Global variables.
+# Column types for the IPMItool and telemetry CSVs, passing these to pandas
+#   avoids type inference and any later casting of the columns.
+POWER_CSV_DTYPES = {'power': np.int32, 'time': np.int64}
+TELEMETRY_CSV_DTYPES = {'time': np.float64,
+                        'tx_good_packets': np.int64,
+                        'tx_good_bytes': np.int64,
+                        'rx_errors': np.int64,
+                        'tx_errors': np.int64,
+                        'rx_dropped_packets': np.int64,
+                        'tx_size_64_packets': np.int64,
+                        'tx_size_65_to_127_packets': np.int64,
+                        'tx_size_128_to_255_packets': np.int64,
+                        'tx_size_256_to_511_packets': np.int64,
+                        'tx_size_512_to_1023_packets': np.int64,
+                        'tx_size_1024_to_1522_packets': np.int64,
+                        'tx_size_1523_to_max_packets': np.int64}
+# Telemetry columns that are read from the last row of the telemetry CSV.
+TELEMETRY_PKT_SIZE_COLS = ['tx_size_64_packets',
+                           'tx_size_65_to_127_packets',
+                           'tx_size_128_to_255_packets',
+                           'tx_size_256_to_511_packets',
+                           'tx_size_512_to_1023_packets',
+                           'tx_size_1024_to_1522_packets',
+                           'tx_size_1523_to_max_packets']
+# Human readable names for the packet sizes in the packet distribution.
+TELEMETRY_PKT_SIZE_NAMES = ['64', '65 to 127', '128 to 255', '256 to 511',
+                            '512 to 1024', '1024 to 1522', '1523 to max']
+# Telemetry column, report label and console warning of each error
+#   statistic, in the order they are shown in the report.
+TELEMETRY_ERRORS = (('rx_errors', 'RX Errors', 'RX errors occurred'),
+                    ('tx_errors', 'TX Errors', 'TX errors occurred'),
+                    ('rx_dropped_packets', 'RX Dropped Packets',
+                     'RX Packets were dropped'))
+TELEMETRY_ERROR_COLS = [column for column, _, _ in TELEMETRY_ERRORS]
+# Config keys of the optimisation steps, as more steps are added then they
+#   will be added here. Optimisation only runs if at least one is enabled.
+OP_STEP_KEYS = ('mem_op',)
+# File name, y axis label and title of the figures for the PCM L3 misses, L2
+#   misses, L3 hits and L2 hits.
+PCM_CACHE_FIGURES = (('l3miss', 'L3 Miss Count', 'L3 Cache Misses'),
+                     ('l2miss', 'L2 Miss Count', 'L2 Cache Misses'),
+                     ('l3hit', 'L3 Hit (%)', 'L3 Cache Hits'),
+                     ('l2hit', 'L2 Hit (%)', 'L2 Cache Hits'))
+# Scale of the PCM L3 misses, L2 misses, L3 hits and L2 hits, the misses are
+#   reported in millions and the hits as a ratio.
+PCM_CACHE_SCALE = np.array([1000000, 1000000, 100, 100],
+                           dtype=np.float64)[:, np.newaxis, np.newaxis]
+# Report html for the telemetry figures and totals, the static markup is
+#   built once and only the values are substituted for each run. The op run
+#   uses the '_op' figures and adds the difference to each value.
+TELEM_HTML_TEMPLATE = Template(
+    '<h2>Telemetry</h2>'
+    '<img src="./tmp/pktdist${suffix}.png" style="max-width: 650px"/><p></p>'
+    '<img src="./tmp/transfer${suffix}.png" style="max-width: 650px"/>'
+    '<p>Total Data Transferred: ${gigabytes}GB${gigabytes_diff}</p>'
+    '<p>Total Packets Transferred: ${packets} packets${packets_diff}</p>'
+    '<img src="./tmp/speeds${suffix}.png" style="max-width: 650px"/>'
+    '<p>Average Throughput: ${throughput} Gbps${throughput_diff}</p>'
+    '<p>Average Packets Per Second: ${pps} pps${pps_diff}</p>')
+# Static head and closing markup of the report index.html.
+REPORT_HTML_HEAD = (
+    '<html><head><title>DOAT Report</title><link rel="stylesheet"'
+    'href="./webcomponents/bootstrap.513.min.css">'
+    '</script><script src="./webcomponents/bootstrap.513.min.js">'
+    '</script><style>@media print{a:not([name="git"])'
+    '{display:none!important}img:not([name="logo"])'
+    '{max-width:100%!important}}</style></head>')
+REPORT_HTML_FOOT = '</div></body></html>'
+# Report header logo and DOAT acknowledgement, these are only added to the
+#   report if the acknowledgement is enabled.
+REPORT_LOGO_HEADER = ('<img src="./webcomponents/doat_logo.png" height="49px" '
+                      'name="logo" style="margin-bottom: 11px;"/> Report')
+REPORT_ACK_HTML = (
+    '<h2>DOAT Acknowledgement</h2><p>'
+    '<img src="./webcomponents/doat_logo.png" height="80px" name="logo"/></p>'
+    '<p>This report was compiled using the DPDK Optimisation &amp; Analysis '
+    'Tool or DOAT for short (<i>Pronunciation: d&omacr;t</i>)</p>'
+    '<p>DOAT is a tool for analysing and assisting in the optimisation of '
+    'applications built using DPDK. DOAT is an out of band analysis tool '
+    'that does not require the DPDK app being analysed to be changed.</p>'
+    '<p>DOAT was developed by <a href="http://conorwalsh.net" '
+    'target="_blank">Conor Walsh (conor@conorwalsh.net)</a> as part of his '
+    'final year project for his degree in Electronic and Computer '
+    'Engineering at the University of Limerick. Hardware and guidance for '
+    'the project was provided by the Networks Platform Group in Intel '
+    '(Shannon, Ireland).</p><p>DOAT is available as an open source project.'
+    '<a href="https://github.com/conorwalsh/doat/" name="git" '
+    'target="_blank>github.com/conorwalsh/doat</a></p>')
+# Report index.html layout, the sections of the report are generated
+#   separately and substituted into it once they are all ready.
+REPORT_HTML_TEMPLATE = Template(
+    REPORT_HTML_HEAD +
+    '<body><div class="p-5 bg-light text-center"><h1>${header}</h1>'
+    '<p style="font-size: 14px">DPDK Optimisation & Analysis Tool</p>'
+    '<p>Report compiled at ${time_sentence} using ${datapoints} data '
+    'points</p>${project_details}</div><div class="container">'
+    '${test_header_unmod}'
+    '<div class="row mt-5" style="page-break-after: always;">${mem_bw}</div>'
+    '<div class="row mt-5" style="page-break-after: always;">'
+    '${wallpower}</div>'
+    '<div class="row mt-5" style="page-break-after: always;">'
+    '${l3_miss}</div>'
+    '<div class="row" style="page-break-after: always;">${l3_hit}</div>'
+    '<div class="row mt-5" style="page-break-after: always;">'
+    '${l2_miss}</div>'
+    '<div class="row" style="page-break-after: always;">${l2_hit}</div>'
+    '<div class="row mt-5" style="page-break-after: always;">'
+    '${telemetry}</div>${test_header_mod}${op}'
+    '<div class="row mt-5"><h2>Test Configuration</h2>${config_table}</div>'
+    '<div class="row mt-5">${ack}</div><br/>'
+    '<div class="row mt-5">${report}</div>' +
+    REPORT_HTML_FOOT)
+# pyplot is slow to import so it is only imported once the figures are
+#   needed, see load_pyplot.
+plt = None
+# Matplotlib settings for the report figures. The fixed subplot margins leave
+#   room for every axis label so figures can be saved without the extra
+#   render pass that bbox_inches='tight' needs to measure the text. The left
+#   margin fits the y label beside the widest tick labels that matplotlib
+#   shows before switching to an offset (six digit counts) and the right
+#   margin fits the second y axis of the telemetry figures.
+matplotlib.rcParams.update({'path.simplify': True,
+                            'path.simplify_threshold': 1.0,
+                            'agg.path.chunksize': 10000,
+                            'axes.unicode_minus': False,
+                            'figure.subplot.left': 0.16,
+                            'figure.subplot.right': 0.86,
+                            'figure.subplot.bottom': 0.12,
+                            'figure.subplot.top': 0.92})
+
+
+def load_pyplot():
+    """
+    Function to import pyplot for the report figures, this is left until the
+    results are analysed so that the import does not delay the test.
+
+    :param: This function takes no arguments.
+    :return: This function has no return value.
+    """
+    global plt
+    import matplotlib.pyplot
+    plt = matplotlib.pyplot
+
+
+def error_heading(label, count, diff=None):
+    """
+    Function to generate the html heading for an error statistic, the heading
+    is red if any errors occurred and green otherwise.
+
+    :param label: The name of the statistic.
+    :param count: The number of errors that occurred.
+    :param diff: The change from the original run, omitted if None.
+    :return: The html heading as a string.
+    """
+    color = 'red' if count != 0 else 'green'
+    diff_text = '' if diff is None else f' ({diff:+0d})'
+    return (f'<h3 style="color:{color};font-weight:bold;">'
+            f'{label}: {count}{diff_text}</h3>')
+
+
+def warn_errors(counts):
+    """
+    Function to warn the user about every error statistic of a test that
+    is not zero.
+
+    :param counts: The count of each statistic in TELEMETRY_ERRORS.
+    :return: This function has no return value.
+    """
+    for (column, _, warning), count in zip(TELEMETRY_ERRORS, counts):
+        if count != 0:
+            print(f'ERROR: {warning} during this test ({column}: {count})')
+
+
+def error_headings(counts, orig_counts=None):
+    """
+    Function to generate the html headings for the error statistics of a
+    test.
+
+    :param counts: The count of each statistic in TELEMETRY_ERRORS.
+    :param orig_counts: The counts of the original run, if given the change
+        from them is shown in each heading.
+    :return: List of the html headings.
+    """
+    if orig_counts is None:
+        diffs = [None] * len(counts)
+    else:
+        diffs = [count - orig for count, orig in zip(counts, orig_counts)]
+    return [error_heading(label, count, diff)
+            for (_, label, _), count, diff in zip(TELEMETRY_ERRORS, counts,
+                                                  diffs)]
+
+
+def plot_figure(series, ylabel, title, out_path, y_top=None):
+    """
+    Function to plot a set of data series against time on the shared figure
+    and save it.
+
+    :param series: List of (x axis, data, label, alpha) tuples to plot, the
+        x axis of the last series sets the upper x limit.
+    :param ylabel: The label for the y axis.
+    :param title: The title of the figure.
+    :param out_path: The path to save the figure to.
+    :param y_top: The upper y limit, left to matplotlib if None.
+    :return: This function has no return value.
+    """
+    plt.clf()
+    for x_axis, data, label, alpha in series:
+        plt.plot(x_axis, data, alpha=alpha, label=label)
+    plt.xlabel('Time (Seconds)')
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.legend()
+    plt.ylim(bottom=0)
+    if y_top is not None:
+        plt.ylim(top=y_top)
+    plt.xlim(left=0)
+    # The time axes only ever increase so their last value is their maximum.
+    plt.xlim(right=series[-1][0][-1])
+    plt.savefig(out_path)
+
+
+def core_series(config, x_axis, core_data, master_data, prefix='',
+                alpha=None):
+    """
+    Function to create the plot series for the per core data of a run.
+
+    :param config: The DOAT config dict.
+    :param x_axis: The time axis of the run.
+    :param core_data: The data of each app core.
+    :param master_data: The data of the master core, only plotted if the
+        master is enabled.
+    :param prefix: The prefix for the labels of the series.
+    :param alpha: The alpha of the app core series.
+    :return: List of (x axis, data, label, alpha) tuples for plot_figure.
+    """
+    series = [(x_axis, data, f'{prefix}Core {config["app_cores"][core]}',
+               alpha)
+              for core, data in enumerate(core_data)]
+    if config["app_master_enabled"] is True:
+        series.append((x_axis, master_data,
+                       f'{prefix}Master Core ({config["app_master_core"]})',
+                       0.5))
+    return series
+
+
+def plot_packet_dist(packet_dist, out_path):
+    """
+    Function to plot the packet size distribution of a test as a bar graph
+    on the shared figure and save it.
+
+    :param packet_dist: The number of packets of each size in
+        TELEMETRY_PKT_SIZE_NAMES.
+    :param out_path: The path to save the figure to.
+    :return: This function has no return value.
+    """
+    plt.clf()
+    # Plot the distribution as a bar graph, the packet size names are used
+    #   directly as the categories of the x axis.
+    plt.bar(TELEMETRY_PKT_SIZE_NAMES, height=packet_dist)
+    plt.xticks(rotation=45)
+    plt.gca().set(xlabel='Packet Sizes (Bytes)',
+                  ylabel='Packets',
+                  title='Packet Size Distribution')
+    # Leave extra room for the rotated packet size labels.
+    plt.subplots_adjust(bottom=0.25)
+    plt.savefig(out_path)
+    plt.subplots_adjust(bottom=plt.rcParams['figure.subplot.bottom'])
+
+
+def plot_core_overlay(runs, config, ylabel, title, out_path):
+    """
+    Function to plot the per core data of the original and modified runs on
+    the same figure and save it.
+
+    :param runs: List of (label prefix, x axis, per core data, master data)
+        tuples, the master data is only plotted if the master is enabled.
+    :param config: The DOAT config dict.
+    :param ylabel: The label for the y axis.
+    :param title: The title of the figure.
+    :param out_path: The path to save the figure to.
+    :return: This function has no return value.
+    """
+    series = []
+    for prefix, x_axis, core_data, master_data in runs:
+        series.extend(core_series(config, x_axis, core_data, master_data,
+                                  f'{prefix} ', 0.7))
+    plot_figure(series, ylabel, title, out_path)
 
 
 def main():
@@ -87,10 +385,7 @@ def main():
         os.makedirs('tmp')
 
     # Pin DOAT to the core specified by the user.
-    subprocess.call(f'taskset -cp {config["test_core"]} {os.getpid()}',
-                    shell=True,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL)
+    os.sched_setaffinity(0, {config['test_core']})
     print('DOAT pinned to core', config['test_core'], 'PID:', os.getpid())
 
     # DOAT will start the first analysis of the DPDK app
@@ -106,7 +401,7 @@ def main():
                                  stdout=subprocess.DEVNULL,
                                  stderr=subprocess.STDOUT,
                                  shell=True,
-                                 preexec_fn=os.setsid)
+                                 start_new_session=True)
     current_test_pid = dpdk_proc.pid
 
     # Register the safe_exit function to run on exit.
@@ -131,100 +426,23 @@ def main():
 
     print('Starting Measurements . . .')
 
-    # Spawn PCM in a new process.
-    # PCM will measure cpu and platform metrics.
-    pcm_proc = subprocess.Popen(f'{config["pcm_dir"]}pcm.x '
-                                f'{config["test_step_size"]} -csv=tmp/pcm.csv',
-                                stdout=subprocess.DEVNULL,
-                                stderr=subprocess.STDOUT,
-                                shell=True,
-                                preexec_fn=os.setsid)
-
-    # Spawn ipmitool in a new process.
-    # IPMItool is used to measure platform power usage.
-    power_proc = subprocess.Popen(
-        r"echo 'power,time\n' > tmp/wallpower.csv; while true; do ipmitool sdr"
-        r" | grep 'PS1 Input Power' | cut -c 20- | cut -f1 -d 'W' | tr -d '\n'"
-        r" | sed 's/.$//' >> tmp/wallpower.csv; echo -n ',' >> "
-        r"tmp/wallpower.csv; date +%s >> tmp/wallpower.csv; sleep "
-        f"{config['test_step_size']}   ; done",
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.STDOUT,
-        shell=True,
-        preexec_fn=os.setsid)
-
-    # If telemetry is enabled then spawn the telemetry tool in a new process.
-    # This tool uses the DPDK telemetry API to get statistics about the
-    #   DPDK app.
-    if config['telemetry'] is True:
-        telemetry_proc = subprocess.Popen(
-            './tools/dpdk_telemetry_auto_csv.py -c tmp/telemetry.csv -r '
-            f'{config["test_runtime"] + 2} -s {config["test_step_size"]} '
-            f'-f {config["file_prefix"]} -p {config["telemetry_port"]}',
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.STDOUT,
-            shell=True,
-            preexec_fn=os.setsid)
-
-    # Wait 2 seconds for the measurement tools to startup.
-    progress_bar(2)
-
-    # Check if IMPItool is still alive after startup. Abort if not
-    if power_proc.poll() is not None:
-        # Kill PCM.
-        kill_group_pid(pcm_proc.pid)
-        # Kill DPDK app.
-        kill_group_pid(dpdk_proc.pid)
-        # Kill telemetry if enabled.
-        if config['telemetry'] is True:
-            kill_group_pid(telemetry_proc.pid)
-        # Exit.
-        sys.exit('IPMItool died or failed to start, ABORT!')
-
-    # Check if PCM is still alive after startup. Abort if not.
-    if pcm_proc.poll() is not None:
-        # Kill IMPItool.
-        kill_group_pid(power_proc.pid)
-        # Kill DPDK app.
-        kill_group_pid(dpdk_proc.pid)
-        # Kill telemetry if enabled.
-        if config['telemetry'] is True:
-            kill_group_pid(telemetry_proc.pid)
-        # Exit.
-        sys.exit('PCM died or failed to start, ABORT! (If problem persists, '
-                 'try to execute \'modprobe msr\' as root user)')
-
-    # If telemetry enabled check if its still alive. Abort if not.
-    if config['telemetry'] is True:
-        if telemetry_proc.poll() is not None:
-            # Kill PCM.
-            kill_group_pid(pcm_proc.pid)
-            # Kill IMPItool.
-            kill_group_pid(power_proc.pid)
-            # Kill DPDK app.
-            kill_group_pid(dpdk_proc.pid)
-            # Exit.
-            sys.exit('Telemetry died or failed to start, ABORT!')
-
-    # Allow test to run and collect statistics for user specified time.
-    print('Running Test . . .')
-    progress_bar(config['test_runtime'])
-
-    # Check if the DPDK App is still alive after the test.
-    app_died_during_test = False
-    if dpdk_proc.poll() is None:
-        print('SUCCESS: DPDK App is still alive after test')
-    else:
-        print('ERROR: DPDK App died during test')
-        app_died_during_test = True
+    # Spawn the measurement tools, they are killed when the test is over.
+    with measurement_tools(config, dpdk_proc):
+        # Allow test to run and collect statistics for user specified time.
+        print('Running Test . . .')
+        progress_bar(config['test_runtime'])
 
-    # Kill all tools.
-    print('Killing test processes')
-    kill_group_pid(current_test_pid)
-    kill_group_pid(pcm_proc.pid)
-    kill_group_pid(power_proc.pid)
-    if config['telemetry'] is True:
-        kill_group_pid(telemetry_proc.pid)
+        # Check if the DPDK App is still alive after the test.
+        app_died_during_test = False
+        if dpdk_proc.poll() is None:
+            print('SUCCESS: DPDK App is still alive after test')
+        else:
+            print('ERROR: DPDK App died during test')
+            app_died_during_test = True
+
+        # Kill the DPDK app and then all tools.
+        print('Killing test processes')
+        kill_group_pid(current_test_pid)
 
     # Abort test if DPDK app died during test.
     if app_died_during_test is True:
@@ -233,135 +451,74 @@ def main():
     # PCM tool exports CSVs that use semicolons instead of the standard comma.
     # Open file and replace all semicolons with commas.
     # This could have been used but its more convenient for the user.
-    csv_file = open('tmp/pcm.csv', 'r')
-    file_data = csv_file.read()
-    csv_file.close()
-    new_data = file_data.replace(';', ',')
-    csv_file = open('tmp/pcm.csv', 'w')
-    csv_file.write(new_data)
-    csv_file.close()
-
-    # Read the PCM CSV using pandas.
-    pcm_data = pandas.read_csv('tmp/pcm.csv', low_memory=False)
-
-    # Calculate how many datapoints are in the PCM CSV.
-    pcm_datapoints = pcm_data.shape[0] * pcm_data.shape[1]
-
-    # Extract socket memory bandwidth read and write to numpy arrays.
-    socket_read = (np.asarray((pcm_data.iloc[:, pcm_data.columns.get_loc(
-        f'Socket {config["app_socket"]}') + 17].tolist())[1:]).astype(float)
-                   * 1000)
-    socket_write = (np.asarray((pcm_data.iloc[:, pcm_data.columns.get_loc(
-        f'Socket {config["app_socket"]}') + 18].tolist())[1:]).astype(float)
-                    * 1000)
+    # The converted lines are kept to be parsed below.
+    pcm_lines = normalise_pcm_csv('tmp/pcm.csv')
+
+    # Import pyplot now that the figures are needed.
+    load_pyplot()
+
+    # The PCM columns that DOAT uses are the memory bandwidth read and write
+    #   of the app socket and the L3 misses, L2 misses, L3 hits and L2 hits
+    #   of each app core followed by the master core if it is enabled.
+    socket_group = f'Socket {config["app_socket"]}'
+    pcm_columns = [(socket_group, 17), (socket_group, 18)]
+    pcm_cores = list(config['app_cores'])
+    if config["app_master_enabled"] is True:
+        pcm_cores.append(config['app_master_core'])
+    # Name the group of each core once rather than for every metric.
+    core_groups = [f'Core{core} (Socket {config["app_socket"]})'
+                   for core in pcm_cores]
+    pcm_columns.extend((group, offset)
+                       for offset in range(4, 8) for group in core_groups)
+
+    # Read the required columns of the PCM CSV and count its datapoints.
+    pcm_datapoints, pcm_data = read_pcm_csv(pcm_lines, pcm_columns)
+    # Split the cache stats into [metric][core][sample] with the master core
+    #   last and scale every metric in a single broadcast multiply. The
+    #   reshape is a view of the parsed array so it is scaled in place.
+    pcm_cache = pcm_data[2:].reshape(4, len(pcm_cores), -1)
+    pcm_cache *= PCM_CACHE_SCALE
+    # Average every metric of every core in a single reduction over the
+    #   samples axis.
+    pcm_cache_avg = np.round(pcm_cache.mean(axis=2, dtype=np.float64), 1)
+
+    # Extract socket memory bandwidth read and write, scaled in place.
+    pcm_data[:2] *= 1000
+    socket_read, socket_write = pcm_data[:2]
 
     # Calculate the average read and write of the memory bandwidth.
-    socket_read_avg = round(sum(socket_read) / len(socket_read), 2)
-    socket_write_avg = round(sum(socket_write) / len(socket_write), 2)
+    socket_read_avg = round(np.mean(socket_read, dtype=np.float64), 2)
+    socket_write_avg = round(np.mean(socket_write, dtype=np.float64), 2)
     # Calculate the ratio of reads to writes.
     socketwritereadratio = round(socket_write_avg / socket_read_avg, 2)
 
     # Declare variables to store cache info for the master core.
-    l3_miss_master = 0
-    l2_miss_master = 0
-    l3_hit_master = 0
-    l2_hit_master = 0
     l3_miss_master_avg = 0.0
     l2_miss_master_avg = 0.0
     l3_hit_master_avg = 0.0
     l2_hit_master_avg = 0.0
-    # If the master core stats are enabled extract the data using pandas.
+    # If the master core stats are enabled extract its averages.
     if config["app_master_enabled"] is True:
-        l3_miss_master = np.asarray((pcm_data.iloc[:, pcm_data.columns.get_loc(
-            f'Core{config["app_master_core"]} '
-            f'(Socket {config["app_socket"]})') + 4].tolist())[1:]).astype(
-                float) * 1000 * 1000
-        l2_miss_master = np.asarray((pcm_data.iloc[:, pcm_data.columns.get_loc(
-            f'Core{config["app_master_core"]} '
-            f'(Socket {config["app_socket"]})') + 5].tolist())[1:]).astype(
-                float) * 1000 * 1000
-        l3_hit_master = np.asarray((pcm_data.iloc[:, pcm_data.columns.get_loc(
-            f'Core{config["app_master_core"]} '
-            f'(Socket {config["app_socket"]})') + 6].tolist())[1:]).astype(
-                float) * 100
-        l2_hit_master = np.asarray((pcm_data.iloc[:, pcm_data.columns.get_loc(
-            f'Core{config["app_master_core"]} '
-            f'(Socket {config["app_socket"]})') + 7].tolist())[1:]).astype(
-                float) * 100
-        l3_miss_master_avg = round(
-            sum(l3_miss_master) / len(l3_miss_master), 1)
-        l2_miss_master_avg = round(
-            sum(l2_miss_master) / len(l2_miss_master), 1)
-        l3_hit_master_avg = round(sum(l3_hit_master) / len(l3_hit_master), 1)
-        l2_hit_master_avg = round(sum(l2_hit_master) / len(l2_hit_master), 1)
-
-    # Declare arrays to store cache info for cores.
-    l3_miss_core = []
-    l2_miss_core = []
-    l3_hit_core = []
-    l2_hit_core = []
-    # Extract cache data for cores.
-    for core in config['app_cores']:
-        l3_miss_core.append(np.asarray((pcm_data.iloc[
-            :, pcm_data.columns.get_loc(
-                f'Core{core} (Socket {config["app_socket"]})') + 4].tolist()
-                                       )[1:]).astype(float) * 1000 * 1000)
-        l2_miss_core.append(np.asarray((pcm_data.iloc[
-            :, pcm_data.columns.get_loc(
-                f'Core{core} (Socket {config["app_socket"]})') + 5].tolist()
-                                        )[1:]).astype(float) * 1000 * 1000)
-        l3_hit_core.append(np.asarray((pcm_data.iloc[
-            :, pcm_data.columns.get_loc(
-                f'Core{core} (Socket {config["app_socket"]})') + 6].tolist()
-                                       )[1:]).astype(float) * 100)
-        l2_hit_core.append(np.asarray((pcm_data.iloc[
-            :, pcm_data.columns.get_loc(
-                f'Core{core} (Socket {config["app_socket"]})') + 7].tolist()
-                                       )[1:]).astype(float) * 100)
-
-    # Declare arrays to store average cache info for cores.
-    l3_miss_core_avg = []
-    l2_miss_core_avg = []
-    l3_hit_core_avg = []
-    l2_hit_core_avg = []
-    # Calculate average cache data for cores.
-    for l3_miss in l3_miss_core:
-        l3_miss_core_avg.append(round(sum(l3_miss) / len(l3_miss), 1))
-    for l2_miss in l2_miss_core:
-        l2_miss_core_avg.append(round(sum(l2_miss) / len(l2_miss), 1))
-    for l3_hit in l3_hit_core:
-        l3_hit_core_avg.append(round(sum(l3_hit) / len(l3_hit), 1))
-    for l2_hit in l2_hit_core:
-        l2_hit_core_avg.append(round(sum(l2_hit) / len(l2_hit), 1))
+        (l3_miss_master_avg, l2_miss_master_avg, l3_hit_master_avg,
+         l2_hit_master_avg) = pcm_cache_avg[:, -1]
+
+    # Extract the average cache data for cores, one value per core.
+    l3_miss_core_avg, l2_miss_core_avg, l3_hit_core_avg, l2_hit_core_avg = (
+        pcm_cache_avg[:, :config['app_cores_no']])
 
     # Create a corresponding time array for the memory bandwidth arrays.
-    socket_x_axis = []
-    time_x = 0
-    for _ in socket_read:
-        socket_x_axis.append(time_x)
-        time_x += config['test_step_size']
+    socket_x_axis = (np.arange(socket_read.size, dtype=np.float64) *
+                     config['test_step_size'])
+    # The highest bandwidth is also used by the op figure so find it once.
+    socket_bw_max = max(socket_read.max(), socket_write.max())
 
     # Generate the read and write memory bandwidth figure.
-    # Each figure must have a unique number.
-    plt.figure(0)
-    # Plot the figure.
-    plt.plot(socket_x_axis, socket_read, label='Read')
-    plt.plot(socket_x_axis, socket_write, label='Write')
-    # Label the x and y axis.
-    plt.xlabel('Time (Seconds)')
-    plt.ylabel('Bandwidth (MBps)')
-    # Title the figure
-    plt.title('Memory Bandwidth')
-    # Enable the legend for the figure.
-    plt.legend()
-    # Set lower x and y limit.
-    plt.ylim(bottom=0)
-    plt.xlim(left=0)
-    # Set upper x and y limit.
-    plt.ylim(top=(max([max(socket_read), max(socket_write)]) + 100))
-    plt.xlim(right=max(socket_x_axis))
-    # Save the figure in the tmp dir.
-    plt.savefig('./tmp/membw.png', bbox_inches='tight')
+    plot_figure([(socket_x_axis, socket_read, 'Read', None),
+                 (socket_x_axis, socket_write, 'Write', None)],
+                'Bandwidth (MBps)',
+                'Memory Bandwidth',
+                './tmp/membw.png',
+                y_top=socket_bw_max + 100)
 
     # Generate the memory bandwidth html code for the report.
     mem_bw_html = ('<h2>Memory Bandwidth</h2>'
@@ -375,20 +532,17 @@ def main():
     # Read the IPMItool CSV using pandas.
     power_data_raw = pandas.read_csv('tmp/wallpower.csv',
                                      sep=',',
-                                     low_memory=False)
+                                     dtype=POWER_CSV_DTYPES)
     # Calculate how many datapoints are in the IPMItool CSV.
     power_datapoints = power_data_raw.shape[0] * power_data_raw.shape[1]
     # Extract the power data from the CSV.
-    power_data = np.asarray(power_data_raw['power'].tolist()).astype(int)
+    power_data = power_data_raw['power'].to_numpy()
     # Extract the time data from the CSV.
-    power_times = np.asarray(power_data_raw['time'].tolist()).astype(int)
+    power_times = power_data_raw['time'].to_numpy()
     # Set the starting time for the time to 0.
-    power_time_zero = power_times[0]
-    power_x_axis = []
-    for power_time in power_times:
-        power_x_axis.append(power_time - power_time_zero)
+    power_x_axis = power_times - power_times[0]
     # Calculate the average power.
-    power_avg = round(sum(power_data) / len(power_data), 1)
+    power_avg = round(power_data.mean(), 1)
 
     # Generate the power html for the report.
     wallpowerhtml = ('<h2>Wall Power</h2>'
@@ -399,232 +553,124 @@ def main():
                      'role="button">Download Power CSV</a>')
 
     # Plot and save the wall power figure.
-    plt.figure(1)
-    plt.plot(power_x_axis, power_data, label='Wall Power')
-    plt.xlabel('Time (Seconds)')
-    plt.ylabel('Power (Watts)')
-    plt.title('Wall Power')
-    plt.legend()
-    plt.ylim(bottom=0)
-    plt.ylim(top=(max(power_data) + 50))
-    plt.xlim(left=0)
-    plt.xlim(right=max(power_x_axis))
-    plt.savefig('./tmp/wallpower.png', bbox_inches='tight')
-
-    # Plot and save the l3 cache miss figure.
-    plt.figure(2)
-    # Loop through all cores and plot their data.
-    for core, data in enumerate(l3_miss_core):
-        plt.plot(socket_x_axis,
-                 data,
-                 label=f'Core {config["app_cores"][core]}')
-    # If the master core is enabled then plot its data.
-    if config["app_master_enabled"] is True:
-        plt.plot(socket_x_axis,
-                 l3_miss_master,
-                 alpha=0.5,
-                 label=f'Master Core ({config["app_master_core"]})')
-    plt.xlabel('Time (Seconds)')
-    plt.ylabel('L3 Miss Count')
-    plt.title('L3 Cache Misses')
-    plt.legend()
-    plt.ylim(bottom=0)
-    plt.xlim(left=0)
-    plt.xlim(right=max(socket_x_axis))
-    plt.savefig('./tmp/l3miss.png', bbox_inches='tight')
+    plot_figure([(power_x_axis, power_data, 'Wall Power', None)],
+                'Power (Watts)',
+                'Wall Power',
+                './tmp/wallpower.png',
+                y_top=power_data.max() + 50)
+
+    # Plot and save the cache figures with a line for every core and the
+    #   master core if it is enabled.
+    for (figure_name, ylabel, title), core_data, master_data in zip(
+            PCM_CACHE_FIGURES, pcm_cache[:, :config['app_cores_no']],
+            pcm_cache[:, -1]):
+        plot_figure(core_series(config, socket_x_axis, core_data,
+                                master_data),
+                    ylabel,
+                    title,
+                    f'./tmp/{figure_name}.png')
 
     # Generate the ls cache misses html for the report.
-    l3_miss_html = (
+    l3_miss_html_parts = [
         '<h2>L3 Cache</h2><img src="./tmp/l3miss.png" '
-        'style="max-width: 650px"/>')
+        'style="max-width: 650px"/>']
     # Generate html for the master core if enabled.
     if config["app_master_enabled"] is True:
-        l3_miss_html += (f'<p>Master Core ({config["app_master_core"]}) '
-                         f'L3 Misses: {l3_miss_master_avg}</p>')
+        l3_miss_html_parts.append(
+            f'<p>Master Core ({config["app_master_core"]}) '
+            f'L3 Misses: {l3_miss_master_avg}</p>')
     # Generate html for all the app cores.
     for core, data in enumerate(l3_miss_core_avg):
-        l3_miss_html += (
+        l3_miss_html_parts.append(
             f'<p>Core {config["app_cores"][core]} L3 Misses: {data}</p>')
+    l3_miss_html = ''.join(l3_miss_html_parts)
 
-    # Plot and save the l2 cache miss figure.
-    # Very similar to l3 cache miss above.
-    plt.figure(3)
-    for core, data in enumerate(l2_miss_core):
-        plt.plot(socket_x_axis,
-                 data,
-                 label=f'Core {config["app_cores"][core]}')
-    if config["app_master_enabled"] is True:
-        plt.plot(socket_x_axis,
-                 l2_miss_master,
-                 alpha=0.5,
-                 label=f'Master Core ({config["app_master_core"]})')
-    plt.xlabel('Time (Seconds)')
-    plt.ylabel('L2 Miss Count')
-    plt.title('L2 Cache Misses')
-    plt.legend()
-    plt.ylim(bottom=0)
-    plt.xlim(left=0)
-    plt.xlim(right=max(socket_x_axis))
-    plt.savefig('./tmp/l2miss.png', bbox_inches='tight')
-    l2_miss_html = (
+    l2_miss_html_parts = [
         '<h2>L2 Cache</h2><img src="./tmp/l2miss.png" '
-        'style="max-width: 650px"/>')
+        'style="max-width: 650px"/>']
     if config["app_master_enabled"] is True:
-        l2_miss_html += (f'<p>Master Core ({config["app_master_core"]}) '
-                         f'L2 Misses: {l3_miss_master_avg}</p>')
+        l2_miss_html_parts.append(
+            f'<p>Master Core ({config["app_master_core"]}) '
+            f'L2 Misses: {l3_miss_master_avg}</p>')
     for core, data in enumerate(l2_miss_core_avg):
-        l2_miss_html += (
+        l2_miss_html_parts.append(
             f'<p>Core {config["app_cores"][core]} L2 Misses: {data}</p>')
+    l2_miss_html = ''.join(l2_miss_html_parts)
 
-    # Plot and save the l3 cache hit figure.
-    # Very similar to l3 cache miss above.
-    plt.figure(4)
-    for core, data in enumerate(l3_hit_core):
-        plt.plot(socket_x_axis,
-                 data,
-                 label=f'Core {config["app_cores"][core]}')
+    l3_hit_html_parts = [
+        '<img src="./tmp/l3hit.png" style="max-width: 650px"/>']
     if config["app_master_enabled"] is True:
-        plt.plot(socket_x_axis,
-                 l3_hit_master,
-                 alpha=0.5,
-                 label=f'Master Core ({config["app_master_core"]})')
-    plt.xlabel('Time (Seconds)')
-    plt.ylabel('L3 Hit (%)')
-    plt.title('L3 Cache Hits')
-    plt.legend()
-    plt.ylim(bottom=0)
-    plt.xlim(left=0)
-    plt.xlim(right=max(socket_x_axis))
-    plt.savefig('./tmp/l3hit.png', bbox_inches='tight')
-    l3_hit_html = '<img src="./tmp/l3hit.png" style="max-width: 650px"/>'
-    if config["app_master_enabled"] is True:
-        l3_hit_html += (f'<p>Master Core ({config["app_master_core"]}) '
-                        f'L3 Hits: {l3_hit_master_avg}%</p>')
+        l3_hit_html_parts.append(
+            f'<p>Master Core ({config["app_master_core"]}) '
+            f'L3 Hits: {l3_hit_master_avg}%</p>')
     for core, data in enumerate(l3_hit_core_avg):
-        l3_hit_html += (
+        l3_hit_html_parts.append(
             f'<p>Core {config["app_cores"][core]} L3 Hits: {data}%</p>')
+    l3_hit_html = ''.join(l3_hit_html_parts)
 
-    # Plot and save the l2 cache hit figure.
-    # Very similar to l3 cache miss above.
-    plt.figure(5)
-    for core, data in enumerate(l2_hit_core):
-        plt.plot(socket_x_axis,
-                 data,
-                 label=f'Core {config["app_cores"][core]}')
-    if config["app_master_enabled"] is True:
-        plt.plot(socket_x_axis,
-                 l2_hit_master,
-                 alpha=0.5,
-                 label=f'Master Core ({config["app_master_core"]})')
-    plt.xlabel('Time (Seconds)')
-    plt.ylabel('L2 Hit (%)')
-    plt.title('L2 Cache Hits')
-    plt.legend()
-    plt.ylim(bottom=0)
-    plt.xlim(left=0)
-    plt.xlim(right=max(socket_x_axis))
-    plt.savefig('./tmp/l2hit.png', bbox_inches='tight')
-    l2_hit_html = '<img src="./tmp/l2hit.png" style="max-width: 650px"/>'
+    l2_hit_html_parts = [
+        '<img src="./tmp/l2hit.png" style="max-width: 650px"/>']
     if config["app_master_enabled"] is True:
-        l2_hit_html += (f'<p>Master Core ({config["app_master_core"]}) '
-                        f'L3 Hits: {l2_hit_master_avg}%</p>')
+        l2_hit_html_parts.append(
+            f'<p>Master Core ({config["app_master_core"]}) '
+            f'L3 Hits: {l2_hit_master_avg}%</p>')
     for core, data in enumerate(l2_hit_core_avg):
-        l2_hit_html += (
+        l2_hit_html_parts.append(
             f'<p>Core {config["app_cores"][core]} L2 Hits: {data}%</p>')
+    l2_hit_html = ''.join(l2_hit_html_parts)
 
     # If telemetry is enabled then do telemetry calculations.
-    telem_html = ''
+    telem_html_parts = []
     telem_datapoints = 0
     if config['telemetry']:
         # Read telemetry data from CSV.
         telem_data = pandas.read_csv('tmp/telemetry.csv',
                                      sep=',',
-                                     low_memory=False)
+                                     dtype=TELEMETRY_CSV_DTYPES)
         # Calculate telemetry datapoints.
         telem_datapoints = telem_data.shape[0] * telem_data.shape[1]
         # Extract telemetry data from pandas (packets and bytes information).
-        telem_packets = np.asarray(
-            telem_data['tx_good_packets'].tolist()).astype(int)
-        telem_bytes = np.asarray(
-            telem_data['tx_good_bytes'].tolist()).astype(int)
-        telem_time = np.asarray(
-            telem_data['time'].tolist()).astype(float)
+        telem_packets = telem_data['tx_good_packets'].to_numpy()
+        telem_bytes = telem_data['tx_good_bytes'].to_numpy()
+        telem_time = telem_data['time'].to_numpy()
+        # The packet distribution and errors only use the final counters so
+        #   slice the last row once and only convert it. Slicing keeps it as a
+        #   DataFrame so each column keeps its dtype.
+        telem_last_row = telem_data.iloc[-1:]
         # Create array for packet distribution using only specific column set.
-        telem_packet_dist = (
-            telem_data.loc[:, ['tx_size_64_packets',
-                               'tx_size_65_to_127_packets',
-                               'tx_size_128_to_255_packets',
-                               'tx_size_256_to_511_packets',
-                               'tx_size_512_to_1023_packets',
-                               'tx_size_1024_to_1522_packets',
-                               'tx_size_1523_to_max_packets']
-                           ].tail(1).values[0])
-        # Array of human readable names for packet distribution.
-        telem_packet_sizes = ['64', '65 to 127', '128 to 255', '256 to 511',
-                              '512 to 1024', '1024 to 1522', '1523 to max']
-        # Extract error and dropped packet data.
-        telem_rx_errors = telem_data.loc[:, 'rx_errors'].tail(1).values[0]
-        telem_rx_errors_bool = False
-        telem_tx_errors = telem_data.loc[:, 'tx_errors'].tail(1).values[0]
-        telem_tx_errors_bool = False
-        telem_rx_dropped = (
-            telem_data.loc[:, 'rx_dropped_packets'].tail(1).values[0])
-        telem_rx_dropped_bool = False
-
-        # Warn the user if any TX or RX errors occurred during the test.
-        if int(telem_rx_errors) != 0:
-            print('ERROR: RX errors occurred during this test (rx_errors:',
-                  f'{telem_rx_errors})')
-            telem_rx_errors_bool = True
-        if int(telem_tx_errors) != 0:
-            print('ERROR: TX errors occurred during this test (tx_errors:',
-                  f'{telem_tx_errors})')
-            telem_tx_errors_bool = True
-
-        # Warn the user if any packets were dropped during the test.
-        if int(telem_rx_dropped) != 0:
-            print('ERROR: RX Packets were dropped during this test',
-                  f'(rx_dropped_packets: {telem_rx_dropped})')
-            telem_rx_dropped_bool = True
+        telem_packet_dist = telem_last_row[TELEMETRY_PKT_SIZE_COLS].to_numpy(
+            dtype=np.int64)[0]
+        # Extract error and dropped packet data, the counts are converted to
+        #   Python ints once as they are only compared and printed.
+        telem_errors = telem_last_row[TELEMETRY_ERROR_COLS].to_numpy(
+            dtype=np.int64)[0].tolist()
+
+        # Warn the user if any errors occurred or packets were dropped during
+        #   the test.
+        warn_errors(telem_errors)
 
         # Generate the packet distribution figure.
-        plt.figure(6)
-        # Create an x axis for the plot.
-        telem_x_axis = np.arange(telem_packet_dist.size)
-        # Plot the distribution as a bar graph.
-        plt.bar(telem_x_axis, height=telem_packet_dist)
-        plt.xticks(telem_x_axis, telem_packet_sizes, rotation=45)
-        plt.xlabel('Packet Sizes (Bytes)')
-        plt.ylabel('Packets')
-        plt.title('Packet Size Distribution')
-        plt.savefig('./tmp/pktdist.png', bbox_inches='tight')
-
-        # Reset the telemetry time to zero.
-        telem_bytes_zero = telem_bytes[0]
-        telem_bytes_reset = []
-        for telem_byte in telem_bytes:
-            telem_bytes_reset.append(telem_byte - telem_bytes_zero)
+        plot_packet_dist(telem_packet_dist, './tmp/pktdist.png')
+
+        # Reset the starting byte count to zero.
+        telem_bytes_reset = telem_bytes - telem_bytes[0]
 
         # Convert the bytes measurements to gigabytes.
-        telem_gigabytes = (
-            [telem_x_axis / 1000000000 for telem_x_axis in telem_bytes_reset])
+        telem_gigabytes = (telem_bytes_reset / 1000000000).astype(np.float32)
 
         # Find how many gigabytes were passed during the test.
-        telem_gigabytes_max = np.round(max(telem_gigabytes), 1)
+        telem_gigabytes_max = round(float(telem_gigabytes.max()), 1)
 
         # Reset the starting packet count to zero.
-        telem_packets_zero = telem_packets[0]
-        telem_packets_reset = []
-        for packets in telem_packets:
-            telem_packets_reset.append(packets - telem_packets_zero)
+        telem_packets_reset = telem_packets - telem_packets[0]
 
         # Find how many packets were passed during the test.
-        telem_packets_reset_max = max(telem_packets_reset)
+        telem_packets_reset_max = telem_packets_reset.max()
 
         # Generate a figure of how many packets and how much data was passed
         #   during the test.
-        plt.figure(7)
-        _, axis_1 = plt.subplots()
+        plt.clf()
+        axis_1 = plt.subplot()
         # Create a second axis for packets.
         axis_2 = axis_1.twinx()
         axis_1.plot(telem_time,
@@ -647,61 +693,31 @@ def main():
         axis_2.legend(loc=1)
         plt.title('Data/Packets Transferred')
         plt.xlim(left=0)
-        plt.xlim(right=max(telem_time))
-        plt.savefig('./tmp/transfer.png', bbox_inches='tight')
+        plt.xlim(right=telem_time[-1])
+        plt.savefig('./tmp/transfer.png')
 
         # Using the packets measurements calculate the
         #   packets per second (pps) array.
-        telem_packets_per_sec = []
-        for packets_x, packets_y in enumerate(telem_packets_reset):
-            # If not the zeroth or first element calculate and append the pps.
-            if packets_x not in (0, 1):
-                telem_packets_per_sec.append(
-                    (packets_y - telem_packets_reset[packets_x - 1]) /
-                    config['test_step_size'])
-            # If the first element calculate the pps, append it to the array
-            #   and update zeroth element.
-            elif packets_x == 1:
-                val = ((packets_y - telem_packets_reset[packets_x - 1]) /
-                       config['test_step_size'])
-                telem_packets_per_sec.append(val)
-                telem_packets_per_sec[0] = val
-            # If the zeroth element dont calculate append placeholder value (0)
-            #   as no previous element exists.
-            else:
-                telem_packets_per_sec.append(0)
+        telem_pps_scale = 1 / config['test_step_size']
+        telem_packets_per_sec = counter_rate(telem_packets_reset,
+                                             telem_pps_scale)
 
         # Calculate the average pps.
         telem_packets_sec_avg = np.round(np.mean(telem_packets_per_sec), 0)
 
-        # Using the bytes measurements calculate the throughput array.
-        telem_throughput = []
-        for bytes_x, bytes_y in enumerate(telem_bytes_reset):
-            # If not the zeroth or first element calculate and append the
-            #   throughput (Note: bits not bytes as per standard).
-            if bytes_x not in (0, 1):
-                telem_throughput.append(
-                    (bytes_y - telem_bytes_reset[bytes_x - 1]) / 1000000000
-                    * 8 / config['test_step_size'])
-            # If the first element calculate the throughput, append it to the
-            #   array and update zeroth element.
-            elif bytes_x == 1:
-                val = (
-                    (bytes_y - telem_bytes_reset[bytes_x - 1]) / 1000000000
-                    * 8 / config['test_step_size'])
-                telem_throughput.append(val)
-                telem_throughput[0] = val
-            # If the zeroth element dont calculate append placeholder value (0)
-            #   as no previous element exists.
-            else:
-                telem_throughput.append(0)
+        # Using the bytes measurements calculate the throughput array
+        #   (Note: bits not bytes as per standard). The bytes to Gbps scale
+        #   is combined into one factor so the array is only multiplied once,
+        #   both scales are reused for the op run.
+        telem_gbps_scale = 8 / (1000000000 * config['test_step_size'])
+        telem_throughput = counter_rate(telem_bytes_reset, telem_gbps_scale)
 
         # Calculate the average throughput.
         telem_throughput_avg = np.round(np.mean(telem_throughput), 2)
 
         # Generate plot of pps and throughput.
-        plt.figure(8)
-        _, axis_1 = plt.subplots()
+        plt.clf()
+        axis_1 = plt.subplot()
         axis_2 = axis_1.twinx()
         axis_1.plot(telem_time,
                     telem_throughput,
@@ -717,80 +733,65 @@ def main():
         axis_2.set_ylabel('Packets Per Second (Packets)')
         axis_1.set_ylim(bottom=0)
         axis_2.set_ylim(bottom=0)
-        axis_2.set_ylim(top=max(telem_packets_per_sec) + 1000000)
-        axis_1.set_ylim(top=max(telem_throughput) + 1)
+        axis_2.set_ylim(top=telem_packets_per_sec.max() + 1000000)
+        axis_1.set_ylim(top=telem_throughput.max() + 1)
         axis_1.legend(loc=2)
         axis_2.legend(loc=1)
         plt.title('Transfer Speeds')
         plt.xlim(left=0)
-        plt.xlim(right=max(telem_time))
-        plt.savefig('./tmp/speeds.png', bbox_inches='tight')
+        plt.xlim(right=telem_time[-1])
+        plt.savefig('./tmp/speeds.png')
 
         # Add generated figures, averages and maximums to the telemetry html.
-        telem_html += (f'<h2>Telemetry</h2><img src="./tmp/pktdist.png" '
-                       'style="max-width: 650px"/><p></p>'
-                       '<img src="./tmp/transfer.png" '
-                       'style="max-width: 650px"/>'
-                       f'<p>Total Data Transferred: {telem_gigabytes_max}GB'
-                       '</p><p>Total Packets Transferred: '
-                       f'{format(telem_packets_reset_max, ",")} packets</p>'
-                       '<img src="./tmp/speeds.png" style="max-width: 650px"/>'
-                       f'<p>Average Throughput: {telem_throughput_avg} Gbps'
-                       '</p><p>Average Packets Per Second: '
-                       f'{format(telem_packets_sec_avg, ",")} pps</p>')
+        telem_html_parts.append(TELEM_HTML_TEMPLATE.substitute(
+            suffix='',
+            gigabytes=telem_gigabytes_max,
+            gigabytes_diff='',
+            packets=format(telem_packets_reset_max, ','),
+            packets_diff='',
+            throughput=telem_throughput_avg,
+            throughput_diff='',
+            pps=format(telem_packets_sec_avg, ','),
+            pps_diff=''))
 
         # Add telemetry CSV to telemetry html.
-        telem_html += ('<p><a href="./tmp/telemetry.csv" class="btn btn-info" '
-                       'role="button">Download Full Telemetry CSV</a></p>'
-                       '<h2>Errors</h2>')
+        telem_html_parts.append(
+            '<p><a href="./tmp/telemetry.csv" class="btn btn-info" '
+            'role="button">Download Full Telemetry CSV</a></p>'
+            '<h2>Errors</h2>')
 
         # Generate Errors and Dropped statistics for telemetry html.
-        if telem_rx_errors_bool is False:
-            telem_html += ('<h3 style="color:green;font-weight:bold;">'
-                           f'RX Errors: {telem_rx_errors}</h3>')
-        else:
-            telem_html += ('<h3 style="color:red;font-weight:bold;">'
-                           f'RX Errors: {telem_rx_errors}</h3>')
-        if telem_tx_errors_bool is False:
-            telem_html += ('<h3 style="color:green;font-weight:bold;">'
-                           f'TX Errors: {telem_tx_errors}</h3>')
-        else:
-            telem_html += ('<h3 style="color:red;font-weight:bold;">'
-                           f'TX Errors: {telem_tx_errors}</h3>')
-
-        if telem_rx_dropped_bool is False:
-            telem_html += ('<h3 style="color:green;font-weight:bold;">'
-                           f'RX Dropped Packets: {telem_rx_dropped}</h3>')
-        else:
-            telem_html += ('<h3 style="color:red;font-weight:bold;">'
-                           f'RX Dropped Packets: {telem_rx_dropped}</h3>')
+        telem_html_parts.extend(error_headings(telem_errors))
 
     # If telemetry is disabled alert user in the report
     else:
-        telem_html += ('<h2>Telemetry</h2>'
-                       '<p style="color:red">Telemetry is disabled</p>')
+        telem_html_parts.append(
+            '<h2>Telemetry</h2>'
+            '<p style="color:red">Telemetry is disabled</p>')
+    telem_html = ''.join(telem_html_parts)
 
     # If PDF generation is enabled then add link to html,
     #   if ZIP generation is enabled add link to html.
-    report_html = ''
+    report_html_parts = []
     if config['generate_pdf'] is True:
-        report_html += ('<p style="text-align:center">'
-                        '<a href="./tmp/doatreport.pdf" '
-                        'class="btn btn-success" role="button" '
-                        'style="font-size: 28px;">Download PDF Report</a></p>')
+        report_html_parts.append(
+            '<p style="text-align:center">'
+            '<a href="./tmp/doatreport.pdf" '
+            'class="btn btn-success" role="button" '
+            'style="font-size: 28px;">Download PDF Report</a></p>')
     if config['generate_zip'] is True:
-        report_html += ('<p style="text-align:center">'
-                        '<a href="./tmp/doat_results.zip" '
-                        'class="btn btn-success" role="button" '
-                        'style="font-size: 28px;">Download Results Zip</a>'
-                        '</p>')
+        report_html_parts.append(
+            '<p style="text-align:center">'
+            '<a href="./tmp/doat_results.zip" '
+            'class="btn btn-success" role="button" '
+            'style="font-size: 28px;">Download Results Zip</a>'
+            '</p>')
+    report_html = ''.join(report_html_parts)
 
     op_html = ''
     op_datapoints = 0
-    steps_enabled = False
     # Check if any optimisation steps are enabled.
-    if config['mem_op'] is True:
-        steps_enabled = True
+    steps_enabled = any(config[step] is True for step in OP_STEP_KEYS)
 
     # If optimisation and any optimisation steps are enabled
     #   then perform optimisation.
@@ -798,64 +799,38 @@ def main():
         # Rewrite DPDK configuration (/config/rte_config.h) with
         #   updated options.
         print('\nModifying DPDK Configuration')
-        for line in fileinput.FileInput(f'{config["dpdk_location"]}'
-                                        '/config/rte_config.h',
-                                        inplace=1):
-            # Change mempool type.
-            if ('RTE_MBUF_DEFAULT_MEMPOOL_OPS' in line and
-                    config['mem_op'] is True):
-                sys.stdout.write('#define RTE_MBUF_DEFAULT_MEMPOOL_OPS '
-                                 '"stack"\n')
-            # Disable mempool cache.
-            elif ('RTE_MEMPOOL_CACHE_MAX_SIZE' in line and
-                  config['mem_op'] is True and config['cache_adjust'] is True):
-                sys.stdout.write(f'#define RTE_MEMPOOL_CACHE_MAX_SIZE '
-                                 '{newcache}\n')
-            # As more steps are added then more elif's will be added here.
-            else:
-                sys.stdout.write(line)
+        op_defines = {}
+        # Change mempool type.
+        if config['mem_op'] is True:
+            op_defines['RTE_MBUF_DEFAULT_MEMPOOL_OPS'] = '"stack"'
+            # Adjust mempool cache.
+            if config['cache_adjust'] is True:
+                op_defines['RTE_MEMPOOL_CACHE_MAX_SIZE'] = config['cache_new']
+        # As more steps are added then more defines will be added here.
+        set_dpdk_config(config['dpdk_location'], op_defines)
 
         # Set the CPU Affinity for DOAT back to normal this will speed up the
         #   build of DPDK as it will run on all available cores instead of one.
         #   In tests while pinned build took ~15 mins while unpinned
         #       took ~2 mins.
-        subprocess.call(f'taskset -cp {config["cpu_aff_orig"]} {os.getpid()}',
-                        shell=True,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL)
+        os.sched_setaffinity(0, config['cpu_aff_orig'])
         print('DOAT unpinned from core to speed up build')
 
         # Build DPDK and DPDK app with new DPDK configuration.
         print('Building DPDK and DPDK App with new configuration options',
               '(This can take several minutes)')
-        dpdk_build = subprocess.Popen(f'cd {config["dpdk_location"]}; '
-                                      f'{config["dpdk_build_cmd"]};',
+        dpdk_build = subprocess.Popen(config['dpdk_build_cmd'],
+                                      cwd=config['dpdk_location'],
                                       shell=True,
                                       stdout=subprocess.DEVNULL,
                                       stderr=subprocess.DEVNULL)
 
         # While DPDK and app are building display build time and
         #   running animation.
-        # The progress of the build is too hard to track and keep clean,
-        #   this animation will however let the user know it hasn't crashed.
-        animation = '|/-\\'
-        animation_index = 0
-        build_time = 0.0
-        while dpdk_build.poll() is None:
-            mins, secs = divmod(int(build_time), 60)
-            print('Building . . .',
-                  f'{mins:02d}:{secs:02d}',
-                  animation[animation_index % len(animation)],
-                  end='\r')
-            animation_index += 1
-            build_time += 0.1
-            time.sleep(0.1)
+        build_progress(dpdk_build)
 
         # Pin DOAT to specified core again.
-        subprocess.call(f'taskset -cp {config["test_core"]} {os.getpid()}',
-                        shell=True,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL)
+        os.sched_setaffinity(0, {config['test_core']})
         print('\nDOAT pinned to core',
               config['test_core'],
               'PID:',
@@ -869,7 +844,7 @@ def main():
                                         stdout=subprocess.DEVNULL,
                                         stderr=subprocess.STDOUT,
                                         shell=True,
-                                        preexec_fn=os.setsid)
+                                        start_new_session=True)
         current_test_pid = op_dpdk_proc.pid
 
         if check_pid(current_test_pid):
@@ -887,82 +862,20 @@ def main():
 
         print('Starting Measurements . . .')
 
-        op_pcm_proc = subprocess.Popen((f'{config["pcm_dir"]}pcm.x '
-                                        f'{config["test_step_size"]} '
-                                        '-csv=tmp/pcm_op.csv'),
-                                       stdout=subprocess.DEVNULL,
-                                       stderr=subprocess.STDOUT,
-                                       shell=True,
-                                       preexec_fn=os.setsid)
-
-        op_power_proc = subprocess.Popen(
-            r"echo 'power,time\n' > tmp/wallpower_op.csv; while true; "
-            r"do ipmitool sdr | grep 'PS1 Input Power' | cut -c 20- |"
-            r" cut -f1 -d 'W' | tr -d '\n' | sed 's/.$//' >> "
-            r"tmp/wallpower_op.csv; echo -n ',' >> tmp/wallpower_op.csv; "
-            r"date +%s >> tmp/wallpower_op.csv; sleep "
-            f"{config['test_step_size']}; done",
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.STDOUT,
-            shell=True,
-            preexec_fn=os.setsid)
-
-        if config['telemetry']:
-            op_telemetry_proc = subprocess.Popen(
-                './tools/dpdk_telemetry_auto_csv.py -c tmp/telemetry_op.csv '
-                f'-r {config["test_runtime"] + 2} '
-                f'-s {config["test_step_size"]} '
-                f'-f {config["file_prefix"]} '
-                f'-p {config["telemetry_port"]}',
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.STDOUT,
-                shell=True,
-                preexec_fn=os.setsid)
-
-        progress_bar(2)
-
-        if op_power_proc.poll() is not None:
-            kill_group_pid(op_pcm_proc.pid)
-            kill_group_pid(op_dpdk_proc.pid)
-            if config['telemetry'] is True:
-                kill_group_pid(op_telemetry_proc.pid)
-            sys.exit('IPMItool died or failed to start, ABORT!')
-
-        if op_pcm_proc.poll() is not None:
-            kill_group_pid(op_power_proc.pid)
-            kill_group_pid(op_dpdk_proc.pid)
-            if config['telemetry'] is True:
-                kill_group_pid(op_telemetry_proc.pid)
-            sys.exit('PCM died or failed to start, ABORT! (If problem '
-                     'persists, try to execute \'modprobe msr\' as root user)')
-
-        if config['telemetry'] is True:
-            if op_telemetry_proc.poll() is not None:
-                kill_group_pid(op_pcm_proc.pid)
-                kill_group_pid(op_power_proc.pid)
-                kill_group_pid(op_dpdk_proc.pid)
-                sys.exit('Telemetry died or failed to start, ABORT!')
+        with measurement_tools(config, op_dpdk_proc, '_op'):
+            print('Running Test . . .')
+            progress_bar(config['test_runtime'])
 
-        print('Running Test . . .')
-        progress_bar(config['test_runtime'])
-
-        op_app_died_during_test = False
-        if op_dpdk_proc.poll() is None:
-            print('SUCCESS: DPDK App is still alive after test')
-        else:
-            print('ERROR: DPDK App died during test')
-            op_app_died_during_test = True
-
-        print('Killing test processes')
-
-        kill_group_pid(current_test_pid)
-
-        kill_group_pid(op_pcm_proc.pid)
+            op_app_died_during_test = False
+            if op_dpdk_proc.poll() is None:
+                print('SUCCESS: DPDK App is still alive after test')
+            else:
+                print('ERROR: DPDK App died during test')
+                op_app_died_during_test = True
 
-        kill_group_pid(op_power_proc.pid)
+            print('Killing test processes')
 
-        if config['telemetry'] is True:
-            kill_group_pid(op_telemetry_proc.pid)
+            kill_group_pid(current_test_pid)
 
         if op_app_died_during_test is True:
             sys.exit('Test invalid due to DPDK App dying during test, ABORT!')
@@ -971,33 +884,21 @@ def main():
         #   Op section also calculates the difference between the old and
         #   new data.
 
-        csv_file = open('tmp/pcm_op.csv', 'r')
-        op_file_data = csv_file.read()
-        csv_file.close()
-
-        op_new_data = op_file_data.replace(';', ',')
-
-        csv_file = open('tmp/pcm_op.csv', 'w')
-        csv_file.write(op_new_data)
-        csv_file.close()
-
-        op_pcm_data = pandas.read_csv('tmp/pcm_op.csv', low_memory=False)
+        op_pcm_lines = normalise_pcm_csv('tmp/pcm_op.csv')
+        op_pcm_datapoints, op_pcm_data = read_pcm_csv(op_pcm_lines,
+                                                      pcm_columns)
+        op_pcm_cache = op_pcm_data[2:].reshape(4, len(pcm_cores), -1)
+        op_pcm_cache *= PCM_CACHE_SCALE
+        op_pcm_cache_avg = np.round(
+            op_pcm_cache.mean(axis=2, dtype=np.float64), 1)
 
-        op_pcm_datapoints = op_pcm_data.shape[0] * op_pcm_data.shape[1]
-
-        op_socket_read = (np.asarray((op_pcm_data.iloc[
-            :, op_pcm_data.columns.get_loc(
-                f'Socket {config["app_socket"]}') + 17].tolist())[1:]).astype(
-                    float) * 1000)
-        op_socket_write = (np.asarray((op_pcm_data.iloc[
-            :, op_pcm_data.columns.get_loc(
-                f'Socket {config["app_socket"]}') + 18].tolist())[1:]).astype(
-                    float) * 1000)
+        op_pcm_data[:2] *= 1000
+        op_socket_read, op_socket_write = op_pcm_data[:2]
 
         op_socket_read_avg = round(
-            sum(op_socket_read) / len(op_socket_read), 2)
+            np.mean(op_socket_read, dtype=np.float64), 2)
         op_socket_write_avg = round(
-            sum(op_socket_write) / len(op_socket_write), 2)
+            np.mean(op_socket_write, dtype=np.float64), 2)
         op_socket_write_read_ratio = round(
             op_socket_write_avg / op_socket_read_avg, 2)
 
@@ -1008,10 +909,6 @@ def main():
             op_socket_write_avg - socket_write_avg) / socket_write_avg) * 100),
                                       1))
 
-        op_l3_miss_master = 0
-        op_l2_miss_master = 0
-        op_l3_hit_master = 0
-        op_l2_hit_master = 0
         op_l3_miss_master_avg = 0.0
         op_l3_miss_master_avg_diff = 0.0
         op_l2_miss_master_avg = 0.0
@@ -1021,136 +918,52 @@ def main():
         op_l2_hit_master_avg = 0.0
         op_l2_hit_master_avg_diff = 0.0
         if config["app_master_enabled"] is True:
-            op_l3_miss_master = np.asarray(
-                (op_pcm_data.iloc[:, op_pcm_data.columns.get_loc(
-                    f'Core{config["app_master_core"]} '
-                    f'(Socket {config["app_socket"]})') + 4].tolist(
-                        ))[1:]).astype(float) * 1000 * 1000
-            op_l2_miss_master = np.asarray(
-                (op_pcm_data.iloc[:, op_pcm_data.columns.get_loc(
-                    f'Core{config["app_master_core"]} '
-                    f'(Socket {config["app_socket"]})') + 5].tolist(
-                        ))[1:]).astype(float) * 1000 * 1000
-            op_l3_hit_master = np.asarray(
-                (op_pcm_data.iloc[:, op_pcm_data.columns.get_loc(
-                    f'Core{config["app_master_core"]} '
-                    f'(Socket {config["app_socket"]})') + 6].tolist(
-                        ))[1:]).astype(float) * 100
-            op_l2_hit_master = np.asarray(
-                (op_pcm_data.iloc[:, op_pcm_data.columns.get_loc(
-                    f'Core{config["app_master_core"]} '
-                    f'(Socket {config["app_socket"]})') + 7].tolist(
-                        ))[1:]).astype(float) * 100
-            op_l3_miss_master_avg = round(
-                sum(op_l3_miss_master) / len(op_l3_miss_master), 1)
+            (op_l3_miss_master_avg, op_l2_miss_master_avg,
+             op_l3_hit_master_avg, op_l2_hit_master_avg) = (
+                op_pcm_cache_avg[:, -1])
             op_l3_miss_master_avg_diff = (
                 round((((op_l3_miss_master_avg - l3_miss_master_avg) /
                         l3_miss_master_avg) * 100), 1))
-            op_l2_miss_master_avg = round(
-                sum(op_l2_miss_master) / len(op_l2_miss_master), 1)
             op_l2_miss_master_avg_diff = (
                 round((((op_l2_miss_master_avg - l2_miss_master_avg) /
                         l2_miss_master_avg) * 100), 1))
-            op_l3_hit_master_avg = round(
-                sum(op_l3_hit_master) / len(op_l3_hit_master), 1)
             op_l3_hit_master_avg_diff = round(
                 op_l3_hit_master_avg - l3_hit_master_avg, 1)
-            op_l2_hit_master_avg = round(
-                sum(op_l2_hit_master) / len(op_l2_hit_master), 1)
             op_l2_hit_master_avg_diff = round(
                 op_l2_hit_master_avg - l2_hit_master_avg, 1)
 
-        op_l3_miss_core = []
-        op_l2_miss_core = []
-        op_l3_hit_core = []
-        op_l2_hit_core = []
-
-        for core in config['app_cores']:
-            op_l3_miss_core.append(np.asarray(
-                (op_pcm_data.iloc[:, op_pcm_data.columns.get_loc(
-                    f'Core{core} (Socket {config["app_socket"]})') + 4].tolist(
-                        ))[1:]).astype(float) * 1000 * 1000)
-            op_l2_miss_core.append(np.asarray(
-                (op_pcm_data.iloc[:, op_pcm_data.columns.get_loc(
-                    f'Core{core} (Socket {config["app_socket"]})') + 5].tolist(
-                        ))[1:]).astype(float) * 1000 * 1000)
-            op_l3_hit_core.append(np.asarray(
-                (op_pcm_data.iloc[:, op_pcm_data.columns.get_loc(
-                    f'Core{core} (Socket {config["app_socket"]})')
-                                  + 6].tolist())[1:]).astype(float) * 100)
-            op_l2_hit_core.append(np.asarray(
-                (op_pcm_data.iloc[:, op_pcm_data.columns.get_loc(
-                    f'Core{core} (Socket {config["app_socket"]})')
-                                  + 7].tolist())[1:]).astype(float) * 100)
-
-        op_l3_miss_core_avg = []
-        op_l3_miss_core_avg_diff = []
-        op_l2_miss_core_avg = []
-        op_l2_miss_core_avg_diff = []
-        op_l3_hit_core_avg = []
-        op_l3_hit_core_avg_diff = []
-        op_l2_hit_core_avg = []
-        op_l2_hit_core_avg_diff = []
-        for core, data in enumerate(op_l3_miss_core):
-            misses = round(sum(data) / len(data), 1)
-            op_l3_miss_core_avg.append(misses)
-            op_l3_miss_core_avg_diff.append(
-                round((((misses - l3_miss_core_avg[core]) /
-                        l3_miss_core_avg[core]) * 100), 1))
-        for core, data in enumerate(op_l2_miss_core):
-            misses = round(sum(data) / len(data), 1)
-            op_l2_miss_core_avg.append(misses)
-            op_l2_miss_core_avg_diff.append(
-                round((((misses - l2_miss_core_avg[core]) /
-                        l2_miss_core_avg[core]) * 100), 1))
-        for core, data in enumerate(op_l3_hit_core):
-            hits = round(sum(data) / len(data), 1)
-            op_l3_hit_core_avg.append(hits)
-            op_l3_hit_core_avg_diff.append(round(
-                hits - l3_hit_core_avg[core], 1))
-        for core, data in enumerate(op_l2_hit_core):
-            hits = round(sum(data) / len(data), 1)
-            op_l2_hit_core_avg.append(hits)
-            op_l2_hit_core_avg_diff.append(
-                round(hits - l2_hit_core_avg[core], 1))
-
-        op_socket_x_axis = []
-        op_time_x_axis = 0
-        for _ in op_socket_read:
-            op_socket_x_axis.append(op_time_x_axis)
-            op_time_x_axis += config['test_step_size']
+        (op_l3_miss_core_avg, op_l2_miss_core_avg, op_l3_hit_core_avg,
+         op_l2_hit_core_avg) = op_pcm_cache_avg[:, :config['app_cores_no']]
+
+        op_l3_miss_core_avg_diff = np.round(
+            (op_l3_miss_core_avg - l3_miss_core_avg) / l3_miss_core_avg * 100,
+            1)
+        op_l2_miss_core_avg_diff = np.round(
+            (op_l2_miss_core_avg - l2_miss_core_avg) / l2_miss_core_avg * 100,
+            1)
+        op_l3_hit_core_avg_diff = np.round(
+            op_l3_hit_core_avg - l3_hit_core_avg, 1)
+        op_l2_hit_core_avg_diff = np.round(
+            op_l2_hit_core_avg - l2_hit_core_avg, 1)
+
+        # Create a corresponding time array for the op memory bandwidth.
+        op_socket_x_axis = (np.arange(op_socket_read.size, dtype=np.float64) *
+                            config['test_step_size'])
 
         # The plots generated are very similar to the plots generated above
         #   except they allow for comparison between the original and new data
         #   by putting them on the same plot.
 
         # Generate the read and write memory bandwidth op figure.
-        plt.figure(10)
-        plt.plot(socket_x_axis,
-                 socket_read,
-                 alpha=0.7,
-                 label='Original Read')
-        plt.plot(socket_x_axis,
-                 socket_write,
-                 alpha=0.7,
-                 label='Original Write')
-        plt.plot(op_socket_x_axis,
-                 op_socket_read,
-                 alpha=0.7,
-                 label='Modified Read')
-        plt.plot(op_socket_x_axis,
-                 op_socket_write,
-                 alpha=0.7,
-                 label='Modified Write')
-        plt.xlabel('Time (Seconds)')
-        plt.ylabel('Bandwidth (MBps)')
-        plt.title('Memory Bandwidth')
-        plt.legend()
-        plt.ylim(bottom=0)
-        plt.xlim(left=0)
-        plt.ylim(top=(max([max(socket_read), max(socket_write)]) + 100))
-        plt.xlim(right=max(op_socket_x_axis))
-        plt.savefig('./tmp/membw_op.png', bbox_inches='tight')
+        plot_figure([(socket_x_axis, socket_read, 'Original Read', 0.7),
+                     (socket_x_axis, socket_write, 'Original Write', 0.7),
+                     (op_socket_x_axis, op_socket_read, 'Modified Read', 0.7),
+                     (op_socket_x_axis, op_socket_write, 'Modified Write',
+                      0.7)],
+                    'Bandwidth (MBps)',
+                    'Memory Bandwidth',
+                    './tmp/membw_op.png',
+                    y_top=socket_bw_max + 100)
 
         op_mem_bw_html = (
             '<h2>Memory Bandwidth</h2>'
@@ -1164,18 +977,13 @@ def main():
 
         op_power_data_raw = pandas.read_csv('tmp/wallpower_op.csv',
                                             sep=',',
-                                            low_memory=False)
+                                            dtype=POWER_CSV_DTYPES)
         op_power_datapoints = (
             op_power_data_raw.shape[0] * op_power_data_raw.shape[1])
-        op_power_data = (
-            np.asarray(op_power_data_raw['power'].tolist()).astype(int))
-        op_power_time = (
-            np.asarray(op_power_data_raw['time'].tolist()).astype(int))
-        op_power_time_zero = op_power_time[0]
-        op_power_x_axis = []
-        for power_time in op_power_time:
-            op_power_x_axis.append(power_time - op_power_time_zero)
-        op_power_avg = round(sum(op_power_data) / len(op_power_data), 1)
+        op_power_data = op_power_data_raw['power'].to_numpy()
+        op_power_time = op_power_data_raw['time'].to_numpy()
+        op_power_x_axis = op_power_time - op_power_time[0]
+        op_power_avg = round(op_power_data.mean(), 1)
         op_power_avg_diff = (
             round((((op_power_avg - power_avg) / power_avg) * 100), 1))
 
@@ -1188,288 +996,133 @@ def main():
             '"role="button">Download Power CSV</a>')
 
         # Plot and save the wall power op figure.
-        plt.figure(11)
-        plt.plot(power_x_axis,
-                 power_data,
-                 alpha=0.7,
-                 label='Original Wall Power')
-        plt.plot(op_power_x_axis,
-                 op_power_data,
-                 alpha=0.7,
-                 label='Modified Wall Power')
-        plt.xlabel('Time (Seconds)')
-        plt.ylabel('Power (Watts)')
-        plt.title('Wall Power')
-        plt.legend()
-        plt.ylim(bottom=0)
-        plt.ylim(top=(max(op_power_data) + 50))
-        plt.xlim(left=0)
-        plt.xlim(right=max(op_power_x_axis))
-        plt.savefig('./tmp/wallpower_op.png', bbox_inches='tight')
-
-        # Plot and save the l3 cache miss op figure.
-        plt.figure(12)
-        for core, data in enumerate(l3_miss_core):
-            plt.plot(socket_x_axis,
-                     data,
-                     alpha=0.7,
-                     label=f'Original Core {config["app_cores"][core]}')
-        if config["app_master_enabled"] is True:
-            plt.plot(socket_x_axis,
-                     l3_miss_master,
-                     alpha=0.5,
-                     label=('Original Master Core '
-                            f'({config["app_master_core"]})'))
-        for core, data in enumerate(op_l3_miss_core):
-            plt.plot(op_socket_x_axis,
-                     data,
-                     alpha=0.7,
-                     label=f'Modified Core {config["app_cores"][core]}')
-        if config["app_master_enabled"] is True:
-            plt.plot(op_socket_x_axis,
-                     op_l3_miss_master,
-                     alpha=0.5,
-                     label=('Modified Master Core '
-                            f'({config["app_master_core"]})'))
-        plt.xlabel('Time (Seconds)')
-        plt.ylabel('L3 Miss Count')
-        plt.title('L3 Cache Misses')
-        plt.legend()
-        plt.ylim(bottom=0)
-        plt.xlim(left=0)
-        plt.xlim(right=max(op_socket_x_axis))
-        plt.savefig('./tmp/l3miss_op.png', bbox_inches='tight')
-        op_l3_miss_html = (
+        plot_figure([(power_x_axis, power_data, 'Original Wall Power', 0.7),
+                     (op_power_x_axis, op_power_data, 'Modified Wall Power',
+                      0.7)],
+                    'Power (Watts)',
+                    'Wall Power',
+                    './tmp/wallpower_op.png',
+                    y_top=op_power_data.max() + 50)
+
+        # Plot and save the cache op figures.
+        for ((figure_name, ylabel, title), core_data, master_data,
+             op_core_data, op_master_data) in zip(
+                PCM_CACHE_FIGURES, pcm_cache[:, :config['app_cores_no']],
+                pcm_cache[:, -1], op_pcm_cache[:, :config['app_cores_no']],
+                op_pcm_cache[:, -1]):
+            plot_core_overlay([('Original', socket_x_axis,
+                                core_data, master_data),
+                               ('Modified', op_socket_x_axis,
+                                op_core_data, op_master_data)],
+                              config,
+                              ylabel,
+                              title,
+                              f'./tmp/{figure_name}_op.png')
+
+        op_l3_miss_html_parts = [
             '<h2>L3 Cache</h2>'
-            '<img src="./tmp/l3miss_op.png" style="max-width: 650px"/>')
+            '<img src="./tmp/l3miss_op.png" style="max-width: 650px"/>']
         if config["app_master_enabled"] is True:
-            op_l3_miss_html += (f'<p>Master Core ({config["app_master_core"]})'
-                                f' L3 Misses: {op_l3_miss_master_avg} '
-                                f'({op_l3_miss_master_avg_diff:+0.1f}%)</p>')
+            op_l3_miss_html_parts.append(
+                f'<p>Master Core ({config["app_master_core"]})'
+                f' L3 Misses: {op_l3_miss_master_avg} '
+                f'({op_l3_miss_master_avg_diff:+0.1f}%)</p>')
         for core, data in enumerate(op_l3_miss_core_avg):
-            op_l3_miss_html += (f'<p>Core {config["app_cores"][core]} '
-                                f'L3 Misses: {data} '
-                                f'({op_l3_miss_core_avg_diff[core]:+0.1f}%)'
-                                '</p>')
-
-        # Plot and save the l2 cache miss op figure.
-        plt.figure(13)
-        for core, data in enumerate(l2_miss_core):
-            plt.plot(socket_x_axis,
-                     data,
-                     alpha=0.7,
-                     label=f'Original Core {config["app_cores"][core]}')
-        if config["app_master_enabled"] is True:
-            plt.plot(socket_x_axis,
-                     l2_miss_master,
-                     alpha=0.5,
-                     label=('Original Master Core '
-                            f'({config["app_master_core"]})'))
-        for core, data in enumerate(op_l2_miss_core):
-            plt.plot(op_socket_x_axis,
-                     data,
-                     alpha=0.7,
-                     label=f'Modified Core {config["app_cores"][core]}')
-        if config["app_master_enabled"] is True:
-            plt.plot(op_socket_x_axis,
-                     op_l2_miss_master,
-                     alpha=0.5,
-                     label=('Modified Master Core '
-                            f'({config["app_master_core"]})'))
-        plt.xlabel('Time (Seconds)')
-        plt.ylabel('L2 Miss Count')
-        plt.title('L2 Cache Misses')
-        plt.legend()
-        plt.ylim(bottom=0)
-        plt.xlim(left=0)
-        plt.xlim(right=max(op_socket_x_axis))
-        plt.savefig('./tmp/l2miss_op.png', bbox_inches='tight')
-        op_l2_miss_html = (
+            op_l3_miss_html_parts.append(
+                f'<p>Core {config["app_cores"][core]} '
+                f'L3 Misses: {data} '
+                f'({op_l3_miss_core_avg_diff[core]:+0.1f}%)'
+                '</p>')
+        op_l3_miss_html = ''.join(op_l3_miss_html_parts)
+
+        op_l2_miss_html_parts = [
             '<h2>L2 Cache</h2>'
-            '<img src="./tmp/l2miss_op.png" style="max-width: 650px"/>')
+            '<img src="./tmp/l2miss_op.png" style="max-width: 650px"/>']
         if config["app_master_enabled"] is True:
-            op_l2_miss_html += (f'<p>Master Core ({config["app_master_core"]})'
-                                f' L2 Misses: {op_l3_miss_master_avg} '
-                                f'({op_l2_miss_master_avg_diff:+0.1f}%)</p>')
+            op_l2_miss_html_parts.append(
+                f'<p>Master Core ({config["app_master_core"]})'
+                f' L2 Misses: {op_l3_miss_master_avg} '
+                f'({op_l2_miss_master_avg_diff:+0.1f}%)</p>')
         for core, data in enumerate(op_l2_miss_core_avg):
-            op_l2_miss_html += (f'<p>Core {config["app_cores"][core]} '
-                                f'L2 Misses: {data} '
-                                f'({op_l2_miss_core_avg_diff[core]:+0.1f}%)'
-                                '</p>')
-
-        # Plot and save the l3 cache hit op figure.
-        plt.figure(14)
-        for core, data in enumerate(l3_hit_core):
-            plt.plot(socket_x_axis,
-                     data,
-                     alpha=0.7,
-                     label=f'Original Core {config["app_cores"][core]}')
-        if config["app_master_enabled"] is True:
-            plt.plot(socket_x_axis,
-                     l3_hit_master,
-                     alpha=0.5,
-                     label=(f'Original Master Core '
-                            f'({config["app_master_core"]})'))
-        for core, data in enumerate(op_l3_hit_core):
-            plt.plot(op_socket_x_axis,
-                     data,
-                     alpha=0.5,
-                     label=f'Modified Core {config["app_cores"][core]}')
-        if config["app_master_enabled"] is True:
-            plt.plot(op_socket_x_axis,
-                     op_l3_hit_master,
-                     alpha=0.5,
-                     label=('Modified Master Core '
-                            f'({config["app_master_core"]})'))
-        plt.xlabel('Time (Seconds)')
-        plt.ylabel('L3 Hit (%)')
-        plt.title('L3 Cache Hits')
-        plt.legend()
-        plt.ylim(bottom=0)
-        plt.xlim(left=0)
-        plt.xlim(right=max(op_socket_x_axis))
-        plt.savefig('./tmp/l3hit_op.png', bbox_inches='tight')
-        op_l3_hit_html = (
-            '<img src="./tmp/l3hit_op.png" style="max-width: 650px"/>')
+            op_l2_miss_html_parts.append(
+                f'<p>Core {config["app_cores"][core]} '
+                f'L2 Misses: {data} '
+                f'({op_l2_miss_core_avg_diff[core]:+0.1f}%)'
+                '</p>')
+        op_l2_miss_html = ''.join(op_l2_miss_html_parts)
+
+        op_l3_hit_html_parts = [
+            '<img src="./tmp/l3hit_op.png" style="max-width: 650px"/>']
         if config["app_master_enabled"] is True:
-            op_l3_hit_html += (f'<p>Master Core ({config["app_master_core"]}) '
-                               f'L3 Hits: {op_l3_hit_master_avg}% '
-                               f'({op_l3_hit_master_avg_diff:+0.1f}%)</p>')
+            op_l3_hit_html_parts.append(
+                f'<p>Master Core ({config["app_master_core"]}) '
+                f'L3 Hits: {op_l3_hit_master_avg}% '
+                f'({op_l3_hit_master_avg_diff:+0.1f}%)</p>')
         for core, data in enumerate(op_l3_hit_core_avg):
-            op_l3_hit_html += (f'<p>Core {config["app_cores"][core]} '
-                               f'L3 Hits: {data}% '
-                               f'({op_l3_hit_core_avg_diff[core]:+0.1f}%)</p>')
-
-        # Plot and save the l2 cache hit op figure.
-        plt.figure(15)
-        for core, data in enumerate(l2_hit_core):
-            plt.plot(socket_x_axis,
-                     data,
-                     alpha=0.7,
-                     label=f'Original Core {config["app_cores"][core]}')
+            op_l3_hit_html_parts.append(
+                f'<p>Core {config["app_cores"][core]} '
+                f'L3 Hits: {data}% '
+                f'({op_l3_hit_core_avg_diff[core]:+0.1f}%)</p>')
+        op_l3_hit_html = ''.join(op_l3_hit_html_parts)
+
+        op_l2_hit_html_parts = [
+            '<img src="./tmp/l2hit_op.png" style="max-width: 650px"/>']
         if config["app_master_enabled"] is True:
-            plt.plot(socket_x_axis,
-                     l2_hit_master,
-                     alpha=0.5,
-                     label=('Original Master Core '
-                            f'({config["app_master_core"]})'))
-        for core, data in enumerate(op_l2_hit_core):
-            plt.plot(op_socket_x_axis,
-                     data,
-                     alpha=0.7,
-                     label=f'Modified Core {config["app_cores"][core]}')
-        if config["app_master_enabled"] is True:
-            plt.plot(op_socket_x_axis,
-                     op_l2_hit_master,
-                     alpha=0.5,
-                     label=('Modified Master Core '
-                            f'({config["app_master_core"]})'))
-        plt.xlabel('Time (Seconds)')
-        plt.ylabel('L2 Hit (%)')
-        plt.title('L2 Cache Hits')
-        plt.legend()
-        plt.ylim(bottom=0)
-        plt.xlim(left=0)
-        plt.xlim(right=max(op_socket_x_axis))
-        plt.savefig('./tmp/l2hit_op.png', bbox_inches='tight')
-        op_l2_hit_html = (
-            '<img src="./tmp/l2hit_op.png" style="max-width: 650px"/>')
-        if config["app_master_enabled"] is True:
-            op_l2_hit_html += (f'<p>Master Core ({config["app_master_core"]}) '
-                               f'L2 Hits: {op_l2_hit_master_avg}% '
-                               f'({op_l2_hit_master_avg_diff:+0.1f}%)</p>')
+            op_l2_hit_html_parts.append(
+                f'<p>Master Core ({config["app_master_core"]}) '
+                f'L2 Hits: {op_l2_hit_master_avg}% '
+                f'({op_l2_hit_master_avg_diff:+0.1f}%)</p>')
         for core, data in enumerate(op_l2_hit_core_avg):
-            op_l2_hit_html += (f'<p>Core {config["app_cores"][core]} L2 Hits: '
-                               f'{data}% '
-                               f'({op_l2_hit_core_avg_diff[core]:+0.1f}%)</p>')
+            op_l2_hit_html_parts.append(
+                f'<p>Core {config["app_cores"][core]} L2 Hits: '
+                f'{data}% '
+                f'({op_l2_hit_core_avg_diff[core]:+0.1f}%)</p>')
+        op_l2_hit_html = ''.join(op_l2_hit_html_parts)
 
-        op_telem_html = ''
+        op_telem_html_parts = []
         op_telem_datapoints = 0
         if config['telemetry'] is True:
             op_telem_data = pandas.read_csv('tmp/telemetry_op.csv',
                                             sep=',',
-                                            low_memory=False)
+                                            dtype=TELEMETRY_CSV_DTYPES)
             op_telem_datapoints = (
                 op_telem_data.shape[0] * op_telem_data.shape[1])
-            op_telem_packets = np.asarray(
-                op_telem_data['tx_good_packets'].tolist()).astype(int)
-            op_telem_bytes = np.asarray(
-                op_telem_data['tx_good_bytes'].tolist()).astype(int)
-            op_telem_time = np.asarray(
-                op_telem_data['time'].tolist()).astype(float)
+            op_telem_packets = op_telem_data['tx_good_packets'].to_numpy()
+            op_telem_bytes = op_telem_data['tx_good_bytes'].to_numpy()
+            op_telem_time = op_telem_data['time'].to_numpy()
+            op_telem_last_row = op_telem_data.iloc[-1:]
             op_telem_packet_dist = (
-                op_telem_data.loc[:, ['tx_size_64_packets',
-                                      'tx_size_65_to_127_packets',
-                                      'tx_size_128_to_255_packets',
-                                      'tx_size_256_to_511_packets',
-                                      'tx_size_512_to_1023_packets',
-                                      'tx_size_1024_to_1522_packets',
-                                      'tx_size_1523_to_max_packets']
-                                  ].tail(1).values[0])
-            op_telem_packet_sizes = ['64', '65 to 127', '128 to 255',
-                                     '256 to 511', '512 to 1024',
-                                     '1024 to 1522', '1523 to max']
-            op_telem_rx_errors = (
-                op_telem_data.loc[:, 'rx_errors'].tail(1).values[0])
-            op_telem_rx_errors_diff = op_telem_rx_errors - telem_rx_errors
-            op_telem_rx_errors_bool = False
-            op_telem_tx_errors = (
-                op_telem_data.loc[:, 'tx_errors'].tail(1).values[0])
-            op_telem_tx_errors_diff = op_telem_tx_errors - telem_tx_errors
-            op_telem_tx_errors_bool = False
-            op_telem_rx_dropped = (
-                op_telem_data.loc[:, 'rx_dropped_packets'].tail(1).values[0])
-            op_telem_rx_dropped_diff = op_telem_rx_dropped - telem_rx_dropped
-            op_telem_rx_dropped_bool = False
-
-            if int(op_telem_rx_errors) != 0:
-                print('ERROR: RX errors occurred during this test (rx_errors:',
-                      f'{op_telem_rx_errors})')
-                op_telem_rx_errors_bool = True
-            if int(op_telem_tx_errors) != 0:
-                print('ERROR: TX errors occurred during this test (tx_errors:',
-                      f'{op_telem_tx_errors})')
-                op_telem_tx_errors_bool = True
-
-            if int(op_telem_rx_dropped) != 0:
-                print('ERROR: RX Packets were dropped during this test',
-                      f'(rx_dropped_packets: {op_telem_rx_dropped})')
-                op_telem_rx_dropped_bool = True
+                op_telem_last_row[TELEMETRY_PKT_SIZE_COLS].to_numpy(
+                    dtype=np.int64)[0])
+            op_telem_errors = (
+                op_telem_last_row[TELEMETRY_ERROR_COLS].to_numpy(
+                    dtype=np.int64)[0].tolist())
+            op_telem_rx_dropped = op_telem_errors[
+                TELEMETRY_ERROR_COLS.index('rx_dropped_packets')]
+
+            warn_errors(op_telem_errors)
 
             # Generate an op figure for packet distribution.
-            plt.figure(16)
-            packet_dist_x_axis = np.arange(op_telem_packet_dist.size)
-            plt.bar(packet_dist_x_axis, height=op_telem_packet_dist)
-            plt.xticks(packet_dist_x_axis, op_telem_packet_sizes, rotation=45)
-            plt.xlabel('Packet Sizes (Bytes)')
-            plt.ylabel('Packets')
-            plt.title('Packet Size Distribution')
-            plt.savefig('./tmp/pktdist_op.png', bbox_inches='tight')
-
-            op_telem_bytes_zero = op_telem_bytes[0]
-            op_telem_bytes_reset = []
-            for op_byte in op_telem_bytes:
-                op_telem_bytes_reset.append(op_byte - op_telem_bytes_zero)
+            plot_packet_dist(op_telem_packet_dist, './tmp/pktdist_op.png')
+
+            op_telem_bytes_reset = op_telem_bytes - op_telem_bytes[0]
 
             op_telem_gigabytes = (
-                [op_bytes / 1000000000 for op_bytes in op_telem_bytes_reset])
+                op_telem_bytes_reset / 1000000000).astype(np.float32)
 
-            op_telem_gigabytes_max = np.round(max(op_telem_gigabytes), 1)
+            op_telem_gigabytes_max = round(float(op_telem_gigabytes.max()), 1)
             op_telem_gigabytes_max_diff = (
                 np.round(op_telem_gigabytes_max - telem_gigabytes_max, 1))
 
-            op_telem_packet_zero = op_telem_packets[0]
-            op_telem_packet_reset = []
-            for op_packets in op_telem_packets:
-                op_telem_packet_reset.append(op_packets - op_telem_packet_zero)
+            op_telem_packet_reset = op_telem_packets - op_telem_packets[0]
 
-            op_telem_packet_reset_max = max(op_telem_packet_reset)
+            op_telem_packet_reset_max = op_telem_packet_reset.max()
             op_telem_packet_reset_max_diff = (
                 np.round(op_telem_packet_reset_max - telem_packets_reset_max,
                          1))
 
-            plt.figure(17)
-            _, axis_1 = plt.subplots()
+            plt.clf()
+            axis_1 = plt.subplot()
             axis_2 = axis_1.twinx()
             axis_1.plot(op_telem_time,
                         op_telem_gigabytes,
@@ -1489,48 +1142,26 @@ def main():
             axis_2.legend(loc=1)
             plt.title('Data/Packets Transferred')
             plt.xlim(left=0)
-            plt.xlim(right=max(op_telem_time))
-            plt.savefig('./tmp/transfer_op.png', bbox_inches='tight')
-
-            op_telem_packet_sec = []
-            for packet_x, data in enumerate(op_telem_packet_reset):
-                if packet_x in (0, 1):
-                    op_telem_packet_sec.append(
-                        (data - op_telem_packet_reset[packet_x - 1]) /
-                        config['test_step_size'])
-                elif packet_x == 1:
-                    val = ((data - op_telem_packet_reset[packet_x - 1]) /
-                           config['test_step_size'])
-                    op_telem_packet_sec.append(val)
-                    op_telem_packet_sec[0] = val
-                else:
-                    op_telem_packet_sec.append(0)
+            plt.xlim(right=op_telem_time[-1])
+            plt.savefig('./tmp/transfer_op.png')
+
+            op_telem_packet_sec = counter_rate(op_telem_packet_reset,
+                                               telem_pps_scale)
 
             op_telem_packet_sec_avg = np.round(np.mean(op_telem_packet_sec), 0)
             op_telem_packet_sec_avg_diff = (
                 np.round(op_telem_packet_sec_avg - telem_packets_sec_avg, 0))
 
-            op_telem_throughput = []
-            for bytes_x, data in enumerate(op_telem_bytes_reset):
-                if bytes_x in (0, 1):
-                    op_telem_throughput.append(
-                        (data - op_telem_bytes_reset[bytes_x - 1])
-                        / 1000000000 * 8 / config['test_step_size'])
-                elif bytes_x == 1:
-                    val = ((data - op_telem_bytes_reset[bytes_x - 1])
-                           / 1000000000 * 8 / config['test_step_size'])
-                    op_telem_throughput.append(val)
-                    op_telem_throughput[0] = val
-                else:
-                    op_telem_throughput.append(0)
+            op_telem_throughput = counter_rate(op_telem_bytes_reset,
+                                               telem_gbps_scale)
 
             op_telem_throughput_avg = np.round(np.mean(op_telem_throughput), 2)
             op_telem_throughput_avg_diff = np.round(
-                op_telem_throughput_avg - op_telem_throughput_avg, 2)
+                op_telem_throughput_avg - telem_throughput_avg, 2)
 
             # Generate am op figure for throughput and pps.
-            plt.figure(18)
-            _, axis_1 = plt.subplots()
+            plt.clf()
+            axis_1 = plt.subplot()
             axis_2 = axis_1.twinx()
             axis_1.plot(telem_time,
                         telem_throughput,
@@ -1555,74 +1186,41 @@ def main():
             axis_2.set_ylabel('Packets Per Second (Packets)')
             axis_1.set_ylim(bottom=0)
             axis_2.set_ylim(bottom=0)
-            axis_2.set_ylim(top=max(op_telem_packet_sec) + 1000000)
-            axis_1.set_ylim(top=max(op_telem_throughput) + 1)
+            axis_2.set_ylim(top=op_telem_packet_sec.max() + 1000000)
+            axis_1.set_ylim(top=op_telem_throughput.max() + 1)
             axis_1.legend(loc=3)
             axis_2.legend(loc=4)
             plt.title('Transfer Speeds')
             plt.xlim(left=0)
-            plt.xlim(right=max(op_telem_time))
-            plt.savefig('./tmp/speeds_op.png', bbox_inches='tight')
-
-            op_telem_html += (
-                '<h2>Telemetry</h2>'
-                '<img src="./tmp/pktdist_op.png" style="max-width: 650px"/>'
-                '<p></p><img src="./tmp/transfer_op.png" '
-                'style="max-width: 650px"/>'
-                f'<p>Total Data Transferred: {op_telem_gigabytes_max}GB '
-                f'({op_telem_gigabytes_max_diff:+0.1f}GB)</p>'
-                '<p>Total Packets Transferred: '
-                f'{format(op_telem_packet_reset_max, ",")}'
-                f' packets ({op_telem_packet_reset_max_diff:+0,.0f} packets)'
-                '</p><img src="./tmp/speeds_op.png" style="max-width: 650px"/>'
-                f'<p>Average Throughput: {op_telem_throughput_avg} Gbps '
-                f'({op_telem_throughput_avg_diff:+0.2f}Gbps)</p>'
-                '<p>Average Packets Per Second: '
-                f'{format(op_telem_packet_sec_avg, ",")}'
-                f' pps ({op_telem_packet_sec_avg_diff:+0,.0f} pps)</p>')
-
-            op_telem_html += (
+            plt.xlim(right=op_telem_time[-1])
+            plt.savefig('./tmp/speeds_op.png')
+
+            op_telem_html_parts.append(TELEM_HTML_TEMPLATE.substitute(
+                suffix='_op',
+                gigabytes=op_telem_gigabytes_max,
+                gigabytes_diff=f' ({op_telem_gigabytes_max_diff:+0.1f}GB)',
+                packets=format(op_telem_packet_reset_max, ','),
+                packets_diff=(
+                    f' ({op_telem_packet_reset_max_diff:+0,.0f} packets)'),
+                throughput=op_telem_throughput_avg,
+                throughput_diff=f' ({op_telem_throughput_avg_diff:+0.2f}Gbps)',
+                pps=format(op_telem_packet_sec_avg, ','),
+                pps_diff=f' ({op_telem_packet_sec_avg_diff:+0,.0f} pps)'))
+
+            op_telem_html_parts.append(
                 '<p><a href="./tmp/telemetry_op.csv" class="btn btn-info" '
                 'role="button">Download Full Telemetry CSV</a></p>'
                 '<h2>Errors</h2>')
 
-            if op_telem_rx_errors_bool is False:
-                op_telem_html += (
-                    '<h3 style="color:green;font-weight:bold;">RX Errors: '
-                    f'{op_telem_rx_errors} ({op_telem_rx_errors_diff:+0d})'
-                    '</h3>')
-            else:
-                op_telem_html += (
-                    '<h3 style="color:red;font-weight:bold;">RX Errors: '
-                    f'{op_telem_rx_errors} ({op_telem_rx_errors_diff:+0d})'
-                    '</h3>')
-            if op_telem_tx_errors_bool is False:
-                op_telem_html += (
-                    '<h3 style="color:green;font-weight:bold;">TX Errors: '
-                    f'{op_telem_tx_errors} ({op_telem_tx_errors_diff:+0d})'
-                    '</h3>')
-            else:
-                op_telem_html += (
-                    '<h3 style="color:red;font-weight:bold;">TX Errors: '
-                    f'{op_telem_tx_errors} ({op_telem_tx_errors_diff:+0d})'
-                    '</h3>')
-
-            if op_telem_rx_dropped_bool is False:
-                op_telem_html += (
-                    '<h3 style="color:green;font-weight:bold;">'
-                    f'RX Dropped Packets: {op_telem_rx_dropped} '
-                    f'({op_telem_rx_dropped_diff:+0d})</h3>')
-            else:
-                op_telem_html += (
-                    '<h3 style="color:red;font-weight:bold;">'
-                    f'RX Dropped Packets: {op_telem_rx_dropped} '
-                    f'({op_telem_rx_dropped_diff:+0d})</h3>')
+            op_telem_html_parts.extend(error_headings(op_telem_errors,
+                                                      telem_errors))
         else:
-            op_telem_html += (
+            op_telem_html_parts.append(
                 '<h2>Telemetry</h2><p style="color:red">'
                 'Telemetry is disabled</p>')
+        op_telem_html = ''.join(op_telem_html_parts)
 
-        op_rec_html = "<h2>Optimisation Recommendations</h2>"
+        op_rec_html_parts = ['<h2>Optimisation Recommendations</h2>']
         # Generate op recommendations.
         # If the mem b/w has improved while there was no decrease in throughput
         #   and no errors or drops, then recommend mem op if not dont.
@@ -1630,7 +1228,7 @@ def main():
                 (opsocketwriteavgdiff < -25.0) and
                 (op_telem_throughput_avg_diff > -0.2) and
                 op_telem_rx_dropped <= 0):
-            op_rec_html += (
+            op_rec_html_parts.append(
                 '<p>It is recommended to change from ring mempools to stack '
                 'mempools based on the optimisation results.<br/>'
                 'This can be done by setting '
@@ -1639,9 +1237,10 @@ def main():
                 'Please manually review this report to confirm that this '
                 'recommendation is right for your project.</p>')
         else:
-            op_rec_html += (
+            op_rec_html_parts.append(
                 '<p>It is recommended not to change from ring mempools to '
                 'stack mempools based on the optimisation results</p>')
+        op_rec_html = ''.join(op_rec_html_parts)
 
         # Generate optimisation html.
         op_html = (
@@ -1665,54 +1264,36 @@ def main():
 
         # Write old DPDK config file back.
         print('\nSetting DPDK Configuration back to original')
-        for line in fileinput.FileInput(f'{config["dpdk_location"]}'
-                                        'config/rte_config.h',
-                                        inplace=1):
-            if ('RTE_MBUF_DEFAULT_MEMPOOL_OPS' in line and
-                    config['mem_op'] is True):
-                sys.stdout.write('#define RTE_MBUF_DEFAULT_MEMPOOL_OPS '
-                                 '"ring_mp_mc"\n')
-            elif ('RTE_MEMPOOL_CACHE_MAX_SIZE' in line and
-                  config['mem_op'] is True and
-                  config['cache_adjust'] is True):
-                sys.stdout.write('#define RTE_MEMPOOL_CACHE_MAX_SIZE '
-                                 f'{config["cache_orig"]}\n')
-            else:
-                sys.stdout.write(line)
+        orig_defines = {}
+        if config['mem_op'] is True:
+            orig_defines['RTE_MBUF_DEFAULT_MEMPOOL_OPS'] = '"ring_mp_mc"'
+            if config['cache_adjust'] is True:
+                orig_defines['RTE_MEMPOOL_CACHE_MAX_SIZE'] = (
+                    config['cache_orig'])
+        set_dpdk_config(config['dpdk_location'], orig_defines)
 
         # Unpin DOAT for DPDK build.
-        subprocess.call(f'taskset -cp {config["cpu_aff_orig"]} {os.getpid()}',
-                        shell=True,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL)
+        os.sched_setaffinity(0, config['cpu_aff_orig'])
         print('DOAT unpinned from core to speed up build')
 
         # Rebuild DPDK with original DPDK config.
         print('Rebuilding DPDK and DPDK App with original configuration',
               'options (This can take several minutes)')
-        dpdk_rebuild = subprocess.Popen(f'cd {config["dpdk_location"]}; '
-                                        f'{config["dpdk_build_cmd"]};',
+        dpdk_rebuild = subprocess.Popen(config['dpdk_build_cmd'],
+                                        cwd=config['dpdk_location'],
                                         shell=True,
                                         stdout=subprocess.DEVNULL,
                                         stderr=subprocess.DEVNULL)
         # Building animation.
-        animation = '|/-\\'
-        animation_index = 0
-        build_time = 0.0
-        while dpdk_rebuild.poll() is None:
-            animation_mins, animation_secs = divmod(int(build_time), 60)
-            print('Building . . .',
-                  f'{animation_mins:02d}:{animation_secs:02d}',
-                  animation[animation_index % len(animation)],
-                  end='\r')
-            animation_index += 1
-            build_time += 0.1
-            time.sleep(0.1)
+        build_progress(dpdk_rebuild)
 
     # If no op steps are enabled then dont run optimisation.
     elif steps_enabled is False:
         print('\nNo Optimisation Steps are enabled skipping optimisation')
 
+    # Every figure has been saved so the shared figure is no longer needed.
+    plt.close()
+
     print('\n\nGenerating report')
 
     # Sum all datapoints used in report.
@@ -1724,16 +1305,18 @@ def main():
     report_time = strftime('%I:%M%p %d/%m/%Y', gmtime())
 
     # If a project name is specified add it to the report.
-    project_details_html = ''
+    project_details_html_parts = []
     if config['project_name']:
-        project_details_html += (
+        project_details_html_parts.append(
             '<p style="font-size: 18px;">'
             f'Project: {config["project_name"]}</p>')
     # If a tester is specified add their details to the report.
     if config['tester_name'] and config['tester_email']:
-        project_details_html += ('<p style="font-size: 18px;">'
-                                 f'Tester: {config["tester_name"]} '
-                                 f'({config["tester_email"]})</p>')
+        project_details_html_parts.append(
+            '<p style="font-size: 18px;">'
+            f'Tester: {config["tester_name"]} '
+            f'({config["tester_email"]})</p>')
+    project_details_html = ''.join(project_details_html_parts)
 
     # If op enabled then split the report under 2 main headings.
     test_header_unmod = ''
@@ -1747,79 +1330,63 @@ def main():
             'Modified DPDK App</h1></div>')
 
     # Generate acknowledgement html if enabled.
-    report_header = ''
-    ack_html = ''
+    # The acknowledgement and logo header are static so they are only
+    #   selected here.
     if config['doat_ack'] is True:
-        report_header = (
-            '<img src="./webcomponents/doat_logo.png" height="49px" '
-            'name="logo" style="margin-bottom: 11px;"/> Report')
-        ack_html = (
-            '<h2>DOAT Acknowledgement</h2><p>'
-            '<img src="./webcomponents/doat_logo.png" height="80px" '
-            'name="logo"/></p>'
-            '<p>This report was compiled using the DPDK Optimisation &amp; '
-            'Analysis Tool or DOAT for short (<i>Pronunciation: d&omacr;t</i>)'
-            '</p><p>DOAT is a tool for analysing and assisting in the '
-            'optimisation of applications built using DPDK. DOAT is an out of '
-            'band analysis tool that does not require the DPDK app being '
-            'analysed to be changed.</p><p>DOAT was developed by '
-            '<a href="http://conorwalsh.net" target="_blank">Conor Walsh '
-            '(conor@conorwalsh.net)</a> as part of his final year project for '
-            'his degree in Electronic and Computer Engineering at the '
-            'University of Limerick. Hardware and guidance for the project '
-            'was provided by the Networks Platform Group in Intel (Shannon, '
-            'Ireland).</p><p>DOAT is available as an open source project.'
-            '<a href="https://github.com/conorwalsh/doat/" name="git" '
-            'target="_blank>github.com/conorwalsh/doat</a></p>')
+        report_header = REPORT_LOGO_HEADER
+        ack_html = REPORT_ACK_HTML
     else:
         report_header = 'DOAT Report'
+        ack_html = ''
 
-    # Create a html file to save the html report.
-    html_index_file = open('index.html', 'w')
     json_table = ''
     if JSON2HTML_AVAILABLE:
-        json_table = ((json2html.convert(json=(str(
-            {section: dict(config['full_json'][section])
-             for section in config['full_json'].sections()}
-            )).replace("\'", "\""))).replace("border=\"1\"", "")).replace(
-                "table", "table class=\"table\"", 1)
+        from json2html import json2html
+        # json2html accepts the config dict directly, no table attributes are
+        #   set so only the outer table needs its class added.
+        json_table = json2html.convert(
+            json={section: dict(config['full_json'][section])
+                  for section in config['full_json'].sections()},
+            table_attributes='').replace('table', 'table class="table"', 1)
     else:
         json_table = ('<p>The json2html python module must be installed to '
                       'show the test configuration.</p>')
-    # Write all parts of the report to the html file.
-    html_index_file.write(
-        '<html><head><title>DOAT Report</title><link rel="stylesheet"'
-        'href="./webcomponents/bootstrap.513.min.css">'
-        '</script><script src="./webcomponents/bootstrap.513.min.js"></script>'
-        '<style>@media print{a:not([name="git"]){display:none!important}'
-        'img:not([name="logo"]){max-width:100%!important}}</style></head>'
-        f'<body><div class="p-5 bg-light text-center"><h1>{report_header}</h1>'
-        '<p style="font-size: 14px">DPDK Optimisation & Analysis Tool</p>'
-        f'<p>Report compiled at {report_time_sentence} using '
-        f'{format(datapoints, ",")} data points</p>{project_details_html}'
-        f'</div><div class="container">{test_header_unmod}'
-        '<div class="row mt-5" style="page-break-after: always;">'
-        f'{mem_bw_html}</div><div class="row mt-5" '
-        'style="page-break-after: always;">'
-        f'{wallpowerhtml}</div><div class="row mt-5" style="page-break-after: '
-        f'always;">{l3_miss_html}</div><div class="row" '
-        f'style="page-break-after: always;">{l3_hit_html}</div><div '
-        f'class="row mt-5" style="page-break-after: always;">{l2_miss_html}'
-        '</div><div class="row" style="page-break-after: always;">'
-        f'{l2_hit_html}</div><div class="row mt-5" style="page-break-after:'
-        f' always;">{telem_html}</div>'
-        f'{test_header_mod}'
-        f'{op_html}'
-        '<div class="row mt-5"><h2>Test Configuration</h2>'
-        f'{json_table}'
-        f'</div><div class="row mt-5">{ack_html}</div><br/>'
-        f'<div class="row mt-5">{report_html}</div></div></body></html>')
-    # Close the html file.
-    html_index_file.close()
+    # Create a html file and write all parts of the report to it.
+    with open('index.html', 'w') as html_index_file:
+        html_index_file.write(REPORT_HTML_TEMPLATE.substitute(
+            header=report_header,
+            time_sentence=report_time_sentence,
+            datapoints=format(datapoints, ','),
+            project_details=project_details_html,
+            test_header_unmod=test_header_unmod,
+            mem_bw=mem_bw_html,
+            wallpower=wallpowerhtml,
+            l3_miss=l3_miss_html,
+            l3_hit=l3_hit_html,
+            l2_miss=l2_miss_html,
+            l2_hit=l2_hit_html,
+            telemetry=telem_html,
+            test_header_mod=test_header_mod,
+            op=op_html,
+            config_table=json_table,
+            ack=ack_html,
+            report=report_html))
+
+    # If Zip generation is enabled then zip all available files in the
+    #   background, the PDF is left out so that it can be generated while the
+    #   zip is being created.
+    if config['generate_zip'] is True:
+        zip_thread = threading.Thread(target=zip_results,
+                                      args=('tmp',
+                                            'config.cfg',
+                                            'tmp/doat_results.zip',
+                                            ('doatreport.pdf',)))
+        zip_thread.start()
 
     # If PDF generation is on then generate the PDF report using the
     #   pdfkit (wkhtmltopdf).
     if config['generate_pdf'] is True:
+        import pdfkit
         pdf_options = {'page-size': 'A4',
                        'quiet': '',
                        'margin-top': '19.1',
@@ -1832,32 +1399,29 @@ def main():
                        'footer-line': '',
                        'print-media-type': ''
                        }
-        wkhtml_to_pdf_loc = subprocess.check_output(
-            'which wkhtmltopdf', shell=True).decode(
-                sys.stdout.encoding).strip()
-        pdf_config = pdfkit.configuration(wkhtmltopdf=wkhtml_to_pdf_loc)
+        pdf_config = pdfkit.configuration(wkhtmltopdf=WKHTMLTOPDF_PATH)
         pdfkit.from_file('index.html',
                          './tmp/doatreport.pdf',
                          configuration=pdf_config,
                          options=pdf_options)
 
-    # If Zip generation is enabled then sort all available files into
-    #   directories, zip the dir and clean up after.
+    # Wait for the zip to finish and then add the PDF to the top level of the
+    #   zip if it was generated.
     if config['generate_zip'] is True:
-        subprocess.call('cp -r tmp archive; cp config.cfg ./archive; '
-                        'cd archive; mkdir raw_data; mkdir figures; '
-                        'mv *.png ./figures; mv *.csv ./raw_data; '
-                        'zip -r ../doat_results.zip *; cd ..; '
-                        'mv doat_results.zip ./tmp/; rm -rf archive;',
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.STDOUT,
-                        shell=True)
+        zip_thread.join()
+        if config['generate_pdf'] is True:
+            with zipfile.ZipFile('tmp/doat_results.zip', 'a',
+                                 compression=zipfile.ZIP_DEFLATED,
+                                 compresslevel=1) as results_zip:
+                results_zip.write('tmp/doatreport.pdf', 'doatreport.pdf')
 
     # Create a new html server at localhost and the specified port.
     server_address = ('', config['server_port'])
     print('Serving results on port', config['server_port'])
     print('CTRL+c to kill server and exit')
-    # Setup the server
+    # Setup the server, http.server is only imported now as it is not needed
+    #   until the report is ready to be served.
+    from http.server import SimpleHTTPRequestHandler, HTTPServer
     http_server = HTTPServer(server_address, SimpleHTTPRequestHandler)
     # Try to serve the report forever until exception.
     try:
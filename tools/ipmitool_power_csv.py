@@ -0,0 +1,120 @@
+#! /usr/bin/env python3
+
+"""
+
+ ipmitool_power_csv.py
+
+ This is a Python3 tool for periodically sampling the platform input power
+    using IPMItool and collating the samples into a CSV file
+
+ Copyright (c) 2022 Conor Walsh
+ This tool is licensed under an MIT license (see included license file)
+
+"""
+
+
+# Import standard modules.
+import argparse
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+
+
+# Global variables.
+# Matches the power reading (in Watts) of the PS1 Input Power sensor in the
+#   output of 'ipmitool sdr', e.g. 'PS1 Input Power  | 168 Watts  | ok'.
+POWER_PATTERN = re.compile(rb'PS1 Input Power\s*\|\s*(\d+)')
+
+
+def sample_power(step_time, csv_path):
+    """
+    Sample the input power every step until the tool is killed.
+
+    :param step_time: The time between measurements.
+    :param csv_path: The path of the csv to store the data.
+    :return: This function has no return value.
+    """
+    # The CSV is opened once and the samples are buffered so they are
+    #   written out in blocks, the buffer is flushed when the file is closed
+    #   on exit (see stop_sampling).
+    with open(csv_path, 'w') as csv_file:
+        csv_file.write('power,time\n')
+        while True:
+            # A failed reading (e.g. a BMC timeout) only skips that sample,
+            #   the same as a reading without the power sensor, so the
+            #   sampling continues for the rest of the test.
+            sdr = subprocess.run(['ipmitool', 'sdr'],
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL)
+            power = None
+            if sdr.returncode == 0:
+                power = POWER_PATTERN.search(sdr.stdout)
+            if power is not None:
+                csv_file.write(f'{power.group(1).decode()},'
+                               f'{int(time.time())}\n')
+            time.sleep(step_time)
+
+
+def stop_sampling(signum, frame):
+    """
+    Signal handler to exit cleanly when DOAT kills the tool at the end of
+    the test so that the buffered samples are written to the CSV.
+
+    :param signum: The number of the signal received.
+    :param frame: The current stack frame.
+    :return: This function has no return value.
+    """
+    sys.exit(0)
+
+
+def args_parse():
+    """
+    Function to parse the arguments passed to the script.
+
+    :param: This function takes no arguments.
+    :return: The arguments object with all the inputted arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description=('This is a Python3 tool for periodically sampling the '
+                     'platform input power using IPMItool and collating the '
+                     'samples into a CSV file.'),
+        formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-s', '--step-time', type=float, dest='step_time',
+                        help='Set the step time for the test (values '
+                             'collected every X seconds) default: 0.25',
+                        default=0.25)
+    parser.add_argument('-c', '--csv', type=str, dest='csv_path',
+                        help='Set the path of the CSV file, default: '
+                             '\'tmp/wallpower.csv\'',
+                        default='tmp/wallpower.csv')
+    return parser.parse_args()
+
+
+def main():
+    """
+    Main function for the script.
+
+    :param: This function takes no arguments.
+    :return: This function has no return value.
+    """
+
+    args = args_parse()
+
+    # Create directory if it doesn't exist.
+    csv_dir = os.path.dirname(args.csv_path)
+    if csv_dir and not os.path.exists(csv_dir):
+        os.makedirs(csv_dir)
+
+    signal.signal(signal.SIGTERM, stop_sampling)
+
+    try:
+        sample_power(args.step_time, args.csv_path)
+    except OSError:
+        sys.exit('IPMItool could not be run')
+
+
+if __name__ == '__main__':
+    main()